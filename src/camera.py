@@ -1,3 +1,5 @@
+import copy
+
 import pygame
 
 from src.constants import WINDOW, CAMERA
@@ -6,10 +8,15 @@ class Camera:
     def __init__(self):
         self.x = 0
         self.y = 0
+        self.prev_x = 0
+        self.prev_y = 0
         self.lerp_speed = CAMERA['LERP_SPEED']
         self.deadzone = CAMERA['DEADZONE']
         
     def update(self, player_rect):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         screen_x = player_rect.centerx - self.x
         screen_y = player_rect.centery - self.y
         
@@ -28,6 +35,13 @@ class Camera:
             else:
                 self.y += (dy + self.deadzone) * self.lerp_speed
         
+    def interpolated(self, t: float) -> 'Camera':
+        """Get a copy of the camera placed t of the way from its previous to its current position"""
+        view = copy.copy(self)
+        view.x = self.prev_x + (self.x - self.prev_x) * t
+        view.y = self.prev_y + (self.y - self.prev_y) * t
+        return view
+
     def apply(self, rect):
         return pygame.Rect(
             rect.x - int(self.x),
@@ -0,0 +1,72 @@
+from src.constants import SIMULATION
+
+class GameClock:
+    """
+    Game time, advanced in fixed ticks instead of read from the wall clock.
+
+    The game loop feeds elapsed real time into accumulate(), which turns it
+    into a number of due ticks according to the time scale; each simulated
+    tick then calls tick() exactly once. Everything inside a tick reads the
+    same value from get_ticks(), in milliseconds like pygame.time.get_ticks,
+    so timers stay in step with per-tick movement however fast the ticks run.
+    """
+    def __init__(self, tick_rate: int = SIMULATION['TICK_RATE']):
+        self.tick_ms = 1000 / tick_rate
+        self.ticks = 0
+        self.time = 0.0
+        self.time_scale = 1.0
+        self.paused = False
+        self.accumulator = 0.0  # Scaled milliseconds not yet simulated
+
+    def get_ticks(self) -> int:
+        """Get the game time in milliseconds"""
+        return int(self.time)
+
+    def tick(self):
+        """Advance game time by one fixed tick"""
+        self.ticks += 1
+        self.time += self.tick_ms
+
+    def accumulate(self, real_seconds: float) -> int:
+        """Add elapsed real time and return how many ticks are now due"""
+        if not self.paused:
+            self.accumulator += real_seconds * 1000 * self.time_scale
+        steps = int(self.accumulator // self.tick_ms)
+        self.accumulator -= steps * self.tick_ms
+        return steps
+
+    def advance(self, real_seconds: float) -> int:
+        """Accumulate real time and tick through every due tick at once"""
+        steps = self.accumulate(real_seconds)
+        for _ in range(steps):
+            self.tick()
+        return steps
+
+    @property
+    def interpolation(self) -> float:
+        """How far game time is between the last tick and the next one (0 to 1)"""
+        return self.accumulator / self.tick_ms
+
+    def reset_accumulator(self):
+        """Forget real time that has not been simulated yet"""
+        self.accumulator = 0.0
+
+    def set_time_scale(self, scale: float):
+        """Run game time faster (> 1) or slower (< 1) than real time"""
+        if scale < 0:
+            print(f"Invalid time scale {scale}, keeping {self.time_scale}")
+            return
+        self.time_scale = scale
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def fast_forward(self, milliseconds: float):
+        """Queue extra game time, simulated as ticks on the next accumulate()"""
+        self.accumulator += milliseconds
@@ -2,7 +2,13 @@
 WINDOW = {
     'WIDTH': 1200,
     'HEIGHT': 800,
-    'FPS': 60
+    'FPS': 60  # Render rate cap, the game itself runs at SIMULATION['TICK_RATE']
+}
+
+# Simulation timing
+SIMULATION = {
+    'TICK_RATE': 60,  # Fixed game updates per second
+    'MAX_STEPS_PER_FRAME': 5,  # Ticks caught up at most after a slow frame
 }
 
 # Colors for rendering
@@ -118,6 +124,21 @@ CAMERA = {
     'LERP_SPEED': 0.1,
     'DEADZONE': 100,
 }
+
+# Collision settings
+COLLISION = {
+    # Must be at least the largest projectile-projectile collision distance
+    'GRID_CELL_SIZE': 64,
+    # Distance a projectile is ray-cast ahead before it gets re-cast
+    'PROJECTILE_CAST_RANGE': 2400,
+}
+
+# Sprite cache settings
+SPRITE_CACHE = {
+    'MAX_SPRITES': 512,
+    'ALPHA_BUCKETS': 16,
+}
+
 # Item settings
 ITEMS = {
     'SPAWN': {
@@ -142,16 +163,29 @@ LEVEL = {
         'MAX_DEPTH': 2,
         'SPLIT_CHANCE': 0.3,
         'CHUNK_RADIUS': 2,
+        'WORKERS': None,  # Chunk generation processes, None for one less than the CPU count
+        'LOOKAHEAD_TICKS': 45,  # How far ahead camera movement is projected when ordering chunks
         'GAPS_PER_WALL': {
             'MIN': 1,
             'MAX': 1,
         }
     },
     'CHUNK_GENERATION_RADIUS': 2,
+    # Generated chunks kept in memory, must hold at least the generation radius
+    'MAX_RESIDENT_CHUNKS': 81,
+    # Side of a wall occupancy cell in pixels, must divide the chunk width and height
+    'OCCUPANCY_CELL_SIZE': 5,
     'GAP_SIZE': 60,
     'SPLIT_CHANCE': 0.3,
 }
 
+# Enemy navigation settings
+NAVIGATION = {
+    'CELL_SIZE': 25,  # Side of a navigation grid cell in pixels, a multiple of LEVEL['OCCUPANCY_CELL_SIZE']
+    'FLOW_FIELD_RADIUS': 32,  # Cells covered by the flow field on each side of the player
+    'PATH_EXPANSIONS_PER_TICK': 200,  # Rooms expanded by long-range searches per tick
+}
+
 # Controller configuration
 CONTROLLER = {
     'BUTTONS': {
@@ -206,6 +240,7 @@ MENU = {
 }
 
 EFFECTS = {
+    'MAX_PARTICLES': 8192,
     'BOOST': {
         'PARTICLE_COUNT': 5,
         'LIFETIME': (10, 20),
@@ -234,7 +234,7 @@ class Controls:
 
     def handle_menu_input(self, menu):
         """Handle menu navigation based on controller type and mouse"""
-        current_time = pygame.time.get_ticks()
+        current_time = menu.clock.get_ticks()
         if current_time < menu.input_cooldown:
             return False
 
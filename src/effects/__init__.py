@@ -2,10 +2,10 @@
 Visual effects and particle systems.
 """
 
-from .particle import Particle
+from .particle_pool import ParticlePool
 from .effect_manager import EffectManager
 
 __all__ = [
-    'Particle',
+    'ParticlePool',
     'EffectManager'
 ] 
\ No newline at end of file
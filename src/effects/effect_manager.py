@@ -1,107 +1,75 @@
 import math
-import random
-import traceback
-from typing import List
 
+import numpy as np
 import pygame
 
-from .particle import Particle
+from .particle_pool import ParticlePool
 from src.constants import COLORS, EFFECTS
 
 class EffectManager:
     def __init__(self):
-        self.particles: List[Particle] = []
+        self.particles = ParticlePool(EFFECTS['MAX_PARTICLES'])
+        self.rng = np.random.default_rng()
     
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
+        self.particles.update()
     
-    def draw(self, surface: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
-        for particle in self.particles[:]:
-            try:
-                if not isinstance(particle.color, (tuple, list)) or len(particle.color) not in (3, 4):
-                    print(f"""Invalid particle detected:
-                        Position: ({particle.x:.2f}, {particle.y:.2f})
-                        Color: {particle.color}
-                        Speed: {particle.speed}
-                        Lifetime: {particle.lifetime}
-                        Size: {particle.size}
-                        Created by: {traceback.extract_stack()[-2][2]}""")
-                    self.particles.remove(particle)
-                    continue
-                particle.draw(surface, camera_x, camera_y)
-            except Exception as e:
-                print(f"""Error drawing particle:
-                    Error: {str(e)}
-                    Position: ({particle.x:.2f}, {particle.y:.2f})
-                    Color: {particle.color}
-                    Speed: {particle.speed}
-                    Lifetime: {particle.lifetime}
-                    Size: {particle.size}
-                    Created by: {traceback.extract_stack()[-2][2]}""")
-                self.particles.remove(particle)
+    def draw(self, surface: pygame.Surface, camera_x: int = 0, camera_y: int = 0,
+             interpolation: float = 1.0):
+        self.particles.draw(surface, camera_x, camera_y, interpolation)
     
     def create_boost_effect(self, x: float, y: float, direction: float):
+        num_particles = EFFECTS['BOOST']['PARTICLE_COUNT']
         opposite_direction = direction + math.pi
         spread = math.radians(EFFECTS['BOOST']['SPREAD'])
         
-        for _ in range(EFFECTS['BOOST']['PARTICLE_COUNT']):
-            angle = opposite_direction + random.uniform(-spread, spread)
-            speed = random.uniform(*EFFECTS['BOOST']['SPEED'])
-            lifetime = random.randint(*EFFECTS['BOOST']['LIFETIME'])
-            
-            particle = Particle(x, y, COLORS['GRAY'], speed, angle, lifetime, size=(random.uniform(0.5, 3)))
-            self.particles.append(particle)
+        angles = opposite_direction + self.rng.uniform(-spread, spread, num_particles)
+        speeds = self.rng.uniform(*EFFECTS['BOOST']['SPEED'], num_particles)
+        lifetimes = self.rng.integers(EFFECTS['BOOST']['LIFETIME'][0],
+                                      EFFECTS['BOOST']['LIFETIME'][1] + 1, num_particles)
+        sizes = self.rng.uniform(0.5, 3, num_particles)
+        
+        self.particles.emit(x, y, COLORS['GRAY'], speeds, angles, lifetimes, sizes)
     
     def create_wall_hit_effect(self, x: float, y: float, wall_normal: float):
-        num_particles = random.randint(*EFFECTS['WALL_HIT']['PARTICLE_COUNT'])
+        num_particles = self.rng.integers(EFFECTS['WALL_HIT']['PARTICLE_COUNT'][0],
+                                          EFFECTS['WALL_HIT']['PARTICLE_COUNT'][1] + 1)
         spread = math.radians(EFFECTS['WALL_HIT']['SPREAD'])
         
-        for _ in range(num_particles):
-            angle = wall_normal + random.uniform(-spread, spread)
-            speed = random.uniform(*EFFECTS['WALL_HIT']['SPEED'])
-            lifetime = random.randint(*EFFECTS['WALL_HIT']['LIFETIME'])
-            size = random.uniform(0.5, 1.5)
-            
-            particle = Particle(x, y, COLORS['DARKGREY'], speed, angle, lifetime, size)
-            self.particles.append(particle)
+        angles = wall_normal + self.rng.uniform(-spread, spread, num_particles)
+        speeds = self.rng.uniform(*EFFECTS['WALL_HIT']['SPEED'], num_particles)
+        lifetimes = self.rng.integers(EFFECTS['WALL_HIT']['LIFETIME'][0],
+                                      EFFECTS['WALL_HIT']['LIFETIME'][1] + 1, num_particles)
+        sizes = self.rng.uniform(0.5, 1.5, num_particles)
+        
+        self.particles.emit(x, y, COLORS['DARKGREY'], speeds, angles, lifetimes, sizes)
     
     def create_phase_change_effect(self, x: float, y: float):
         num_particles = EFFECTS['PHASE_CHANGE']['PARTICLE_COUNT']
         spiral_tightness = 0.5
         base_speed = 3
+        lifetime = EFFECTS['PHASE_CHANGE']['LIFETIME']
+        
+        index = np.arange(num_particles)
+        angles = index * (2 * math.pi / num_particles)
+        distances = index * spiral_tightness
         
-        # Use RGB color without alpha - let Particle handle alpha
-        particle_color = COLORS['RED']  # This should be (255, 0, 0)
+        start_x = x + np.cos(angles) * distances
+        start_y = y + np.sin(angles) * distances
         
-        for i in range(num_particles):
-            angle = i * (2 * math.pi / num_particles)
-            distance = i * spiral_tightness
-            
-            start_x = x + math.cos(angle) * distance
-            start_y = y + math.sin(angle) * distance
-            
-            # Outward particle
-            particle = Particle(start_x, start_y, COLORS['PURPLE'], 
-                              base_speed, angle, 
-                              EFFECTS['PHASE_CHANGE']['LIFETIME'], size=5)
-            self.particles.append(particle)
-            
-            # Inward particle (delayed)
-            inward_particle = Particle(start_x, start_y, COLORS['PURPLE'],
-                                     base_speed, angle + math.pi, 
-                                     EFFECTS['PHASE_CHANGE']['LIFETIME'], size=8)
-            # Add the delay to the lifetime
-            inward_particle.lifetime = EFFECTS['PHASE_CHANGE']['LIFETIME']
-            inward_particle.original_lifetime = inward_particle.lifetime + EFFECTS['PHASE_CHANGE']['INWARD_DELAY']
-            self.particles.append(inward_particle)
+        # Outward particles
+        self.particles.emit(start_x, start_y, COLORS['PURPLE'],
+                            base_speed, angles, lifetime, size=5)
+        
+        # Inward particles, fading as if they started INWARD_DELAY frames earlier
+        self.particles.emit(start_x, start_y, COLORS['PURPLE'],
+                            base_speed, angles + math.pi, lifetime, size=8,
+                            original_lifetime=lifetime + EFFECTS['PHASE_CHANGE']['INWARD_DELAY'])
     
     def create_movement_change_effect(self, x: float, y: float):
         num_particles = EFFECTS['MOVEMENT_CHANGE']['PARTICLE_COUNT']
-        for i in range(num_particles):
-            angle = i * (2 * math.pi / num_particles)
-            
-            particle = Particle(x, y, COLORS['RED'], 
-                              EFFECTS['MOVEMENT_CHANGE']['SPEED'],
-                              angle, EFFECTS['MOVEMENT_CHANGE']['LIFETIME'], size=4)
-            self.particles.append(particle)
-    
\ No newline at end of file
+        angles = np.arange(num_particles) * (2 * math.pi / num_particles)
+        
+        self.particles.emit(x, y, COLORS['RED'],
+                            EFFECTS['MOVEMENT_CHANGE']['SPEED'],
+                            angles, EFFECTS['MOVEMENT_CHANGE']['LIFETIME'], size=4)
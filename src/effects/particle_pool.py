@@ -0,0 +1,139 @@
+from typing import Tuple
+
+import numpy as np
+import pygame
+
+from src.constants import SPRITE_CACHE
+from src.utils.sprite_cache import get_circle_sprite
+
+class ParticlePool:
+    """
+    Fixed capacity, NumPy-backed particle storage.
+
+    Slot i of every array belongs to the same particle. Particles are
+    integrated and faded in one vectorized step per frame, and dead ones are
+    dropped by packing the live slots to the front. Bursts that do not fit
+    in the remaining capacity are truncated.
+    """
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'prev_x': np.float64,  # Position before the last update, for render interpolation
+        'prev_y': np.float64,
+        'vx': np.float64,
+        'vy': np.float64,
+        'lifetime': np.int32,
+        'original_lifetime': np.int32,
+        'size': np.float64,
+        'alpha': np.int32,
+    }
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def emit(self, x, y, color: Tuple[int, ...], speed, direction, lifetime, size,
+             original_lifetime=None):
+        """
+        Add a burst of particles
+        Every argument except color may be a scalar or an array with one value
+        per particle; direction is in radians.
+        """
+        if not isinstance(color, (tuple, list)) or len(color) not in (3, 4):
+            print(f"Invalid particle color {color}, burst skipped")
+            return
+        if original_lifetime is None:
+            original_lifetime = lifetime
+
+        # At least 1-d, so an all-scalar call emits a single particle
+        x, y, speed, direction, lifetime, size, original_lifetime = np.atleast_1d(*np.broadcast_arrays(
+            x, y, speed, direction, lifetime, size, original_lifetime
+        ))
+        n = min(x.size, self.capacity - self.count)
+        if n <= 0:
+            return
+        
+        burst = slice(self.count, self.count + n)
+        self.x[burst] = x[:n]
+        self.y[burst] = y[:n]
+        self.prev_x[burst] = x[:n]
+        self.prev_y[burst] = y[:n]
+        self.vx[burst] = np.cos(direction[:n]) * speed[:n]
+        self.vy[burst] = np.sin(direction[:n]) * speed[:n]
+        self.lifetime[burst] = lifetime[:n]
+        self.original_lifetime[burst] = original_lifetime[:n]
+        self.size[burst] = size[:n]
+        self.alpha[burst] = 255
+        self.color[burst] = color[:3]
+        self.count += n
+
+    def update(self):
+        """Move and fade every particle, then drop the expired ones"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.lifetime[:n] -= 1
+        
+        # Calculate alpha based on remaining lifetime
+        self.alpha[:n] = self.lifetime[:n] * 255 // self.original_lifetime[:n]
+        
+        keep = self.lifetime[:n] > 0
+        live = int(np.count_nonzero(keep))
+        if live == n:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:live] = array[:n][keep]
+        self.color[:live] = self.color[:n][keep]
+        self.count = live
+
+    def draw(self, surface: pygame.Surface, camera_x: int = 0, camera_y: int = 0,
+             interpolation: float = 1.0):
+        """
+        Draw every particle with a single batched blit
+        Sizes are quantized to half pixels and alpha to the sprite cache's
+        buckets, so the whole frame only needs a handful of pre-faded sprites.
+        interpolation: How far between the previous and current update to draw
+        """
+        n = self.count
+        size = np.round(self.size[:n] * 2) / 2
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * interpolation
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * interpolation
+        screen_x = x - size - camera_x
+        screen_y = y - size - camera_y
+        
+        # Skip particles that are invisible or off screen
+        width, height = surface.get_size()
+        visible = np.flatnonzero(
+            (self.alpha[:n] > 0) & (size > 0) &
+            (screen_x < width) & (screen_x + size * 2 > 0) &
+            (screen_y < height) & (screen_y + size * 2 > 0)
+        )
+        if len(visible) == 0:
+            return
+        
+        # One key per (size, color, alpha bucket) combination
+        alpha_step = 256 // SPRITE_CACHE['ALPHA_BUCKETS']
+        color = self.color[visible].astype(np.int64)
+        keys = (((size[visible] * 2).astype(np.int64) << 32) |
+                (color[:, 0] << 24) | (color[:, 1] << 16) | (color[:, 2] << 8) |
+                (self.alpha[visible] // alpha_step))
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        
+        sprites = [
+            get_circle_sprite(size[visible[i]], tuple(color[i].tolist()), int(self.alpha[visible[i]]))
+            for i in first.tolist()
+        ]
+        surface.blits(
+            [(sprites[sprite], position) for sprite, position in
+             zip(inverse.tolist(), zip(screen_x[visible].tolist(), screen_y[visible].tolist()))],
+            False
+        )
@@ -1,6 +1,7 @@
 from .enemy import Enemy
 from .player import Player
 from .projectile import Projectile
+from .projectile_buffer import ProjectileBuffer
 
 # This allows you to do: from src.entities import Player, Enemy, Projectile
-__all__ = ['Player', 'Enemy', 'Projectile']
+__all__ = ['Player', 'Enemy', 'Projectile', 'ProjectileBuffer']
@@ -10,10 +10,16 @@ from src.constants import (
     ENEMY,
     COLORS
 )
-from src.utils.prediction import calculate_intercept_point
+from src.utils.sprite_cache import get_circle_sprite
 
 class Enemy:
     def __init__(self, game):
+        # Timers run on game time, not wall time
+        self.clock = game.game_clock
+        self.scheduler = game.scheduler
+        self.timers = {}
+        self.expired_timers = set()
+        
         # Basic setup
         self.radius = ENEMY['RADIUS']
         self.image = None
@@ -38,8 +44,8 @@ class Enemy:
         
         # State management
         self.state = "move_towards_player"
-        self.last_state_change = pygame.time.get_ticks()
-        self.next_state_change = random.randint(3000, 8000)
+        self.state_timer = self.scheduler.schedule_in(random.randint(3000, 8000), self.change_state)
+        self.in_phase_transition = False
         
         # Phase states mapping
         self.phase_states = {
@@ -75,7 +81,8 @@ class Enemy:
 
         # Dash variables (movement 3)   
         self.dashing = True
-        self.last_dash_time = pygame.time.get_ticks()
+        self.last_dash_time = self.clock.get_ticks()
+        self.start_timer('dash', ENEMY['MOVEMENT']['DASH']['DURATION'])
         self.dash_angle = 0
         self.dash_speed = ENEMY['MOVEMENT']['DASH']['SPEED']
         self.dash_duration = ENEMY['MOVEMENT']['DASH']['DURATION']
@@ -85,13 +92,32 @@ class Enemy:
         self.next_shot_interval = random.randint(800, 1200)
         self.initial_angle = 0
         self.circle_start_time = 0
-        self.last_shot_time = 0
+        self.start_timer('middle_shoot', self.next_shot_interval)
 
         # Movement 5 variables
 
         # Movement 6 variables
         
 
+    def start_timer(self, name: str, delay: float):
+        """(Re)start the named timer, timer_expired(name) turns True after delay ms"""
+        timer = self.timers.get(name)
+        if timer:
+            timer.cancel()
+        self.expired_timers.discard(name)
+        self.timers[name] = self.scheduler.schedule_in(delay, self.expired_timers.add, name)
+
+    def timer_expired(self, name: str) -> bool:
+        return name in self.expired_timers
+
+    def cancel_timers(self):
+        """Cancel every pending timer, used when the enemy leaves the game"""
+        self.state_timer.cancel()
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+        self.expired_timers.clear()
+
     def take_damage(self, damage):
         self.current_health -= damage
         
@@ -134,6 +160,7 @@ class Enemy:
                 )
                 
                 # Remove original enemy
+                self.cancel_timers()
                 self.game.enemy = None
             else:
                 # Normal phase transition logic
@@ -146,55 +173,59 @@ class Enemy:
                     self.rect.centery
                 )
                  # Add transition variables
-                self.phase_transition_start = pygame.time.get_ticks()
+                self.phase_transition_start = self.clock.get_ticks()
                 self.phase_transition_duration = 1500  # 1.5 seconds pause
                 self.in_phase_transition = True
                 self.transition_color = COLORS['RED']  # Starting color
+                self.scheduler.schedule_in(self.phase_transition_duration, self.end_phase_transition)
 
-    def update_state(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_state_change >= self.next_state_change:
-            old_state = self.state
-            self.state = random.choice(self.phase_states[self.current_phase])
-            if old_state != self.state:
-                # Create movement change effect
-                self.game.effect_manager.create_movement_change_effect(
-                    self.rect.centerx,
-                    self.rect.centery
-                )
-            self.last_state_change = current_time
-            self.next_state_change = random.randint(3000, 8000)
+    def end_phase_transition(self):
+        self.in_phase_transition = False
+
+    def change_state(self):
+        """Timer callback, switch to a random state of the current phase"""
+        if self.in_phase_transition:
+            # States do not change during a phase transition, retry once it is over
+            self.state_timer = self.scheduler.schedule(
+                self.phase_transition_start + self.phase_transition_duration, self.change_state
+            )
+            return
+        
+        old_state = self.state
+        self.state = random.choice(self.phase_states[self.current_phase])
+        if old_state != self.state:
+            # Create movement change effect
+            self.game.effect_manager.create_movement_change_effect(
+                self.rect.centerx,
+                self.rect.centery
+            )
+        self.state_timer = self.scheduler.schedule_in(random.randint(3000, 8000), self.change_state)
 
-    def move(self, player_position, walls=None):
+    def move(self, player_position, level=None):
         # Check if we're in a phase transition
-        if hasattr(self, 'in_phase_transition') and self.in_phase_transition:
-            current_time = pygame.time.get_ticks()
-            elapsed = current_time - self.phase_transition_start
+        if self.in_phase_transition:
+            elapsed = self.clock.get_ticks() - self.phase_transition_start
             
-            if elapsed >= self.phase_transition_duration:
-                self.in_phase_transition = False
-            else:
-                # Calculate transition progress (0 to 1)
-                progress = elapsed / self.phase_transition_duration
-                # Interpolate between red and purple
-                transition_color = self.interpolate_color(
-                    COLORS['RED'],
-                    COLORS['PURPLE'],
-                    progress
-                )
-                self.update_image(transition_color)
+            # Calculate transition progress (0 to 1)
+            progress = min(elapsed / self.phase_transition_duration, 1.0)
+            # Interpolate between red and purple
+            transition_color = self.interpolate_color(
+                COLORS['RED'],
+                COLORS['PURPLE'],
+                progress
+            )
+            self.update_image(transition_color)
             return []  # Return empty list since we're not shooting during transition
         
-        self.update_state()
         new_projectiles = []
         
         # Phase 1 movements
         if self.state == "move_towards_player":
-            self.move_towards_player(player_position, walls)
+            self.move_towards_player(player_position, level)
         elif self.state == "sweep_towards_player":
-            self.sweep_towards_player(player_position, walls)
+            self.sweep_towards_player(player_position, level)
         elif self.state == "dash_toward_player":
-            self.dash_toward_player(player_position, walls)
+            self.dash_toward_player(player_position, level)
             
         # Phase 2 movements
         elif self.state == "middle_shoot":
@@ -262,36 +293,33 @@ class Enemy:
         return self.orbit_angle
 
     def middle_shoot(self, player_position):
-        current_time = pygame.time.get_ticks()
         new_projectiles = []
         
         orbit_angle = self.orbit_around_point(player_position)
         
-        if current_time - self.last_shot_time >= self.next_shot_interval:
+        if self.timer_expired('middle_shoot'):
             for i in range(8):
                 shot_angle = (i * math.pi / 4) + orbit_angle
                 projectile = self.shoot(shot_angle, 'PHASE_TWO')
                 new_projectiles.append(projectile)
                 
-            self.last_shot_time = current_time
             self.next_shot_interval = random.randint(500, 1500)
+            self.start_timer('middle_shoot', self.next_shot_interval)
         
         return new_projectiles
 
     def movement_5(self, player_position):
-        # Initialize shooting variables if they don't exist
-        if not hasattr(self, 'last_triple_shot_time'):
-            self.last_triple_shot_time = pygame.time.get_ticks()
-            self.triple_shot_interval = random.randint(1000, 2000)  # Time between triple shots
+        # Start the volley timer the first time this movement runs
+        if 'movement_5' not in self.timers:
+            self.start_timer('movement_5', random.randint(1000, 2000))  # Time between triple shots
 
-        current_time = pygame.time.get_ticks()
         new_projectiles = []
         
         # Use orbital movement
         orbit_angle = self.orbit_around_point(player_position, orbit_radius=250, rotation_speed=0.03)
         
         # Handle shooting
-        if current_time - self.last_triple_shot_time >= self.triple_shot_interval:
+        if self.timer_expired('movement_5'):
             # Calculate angle to player
             dx = player_position[0] - self.rect.centerx
             dy = player_position[1] - self.rect.centery
@@ -303,53 +331,24 @@ class Enemy:
                 shot_angle = base_angle + spread
                 new_projectiles.append(self.shoot(shot_angle, 'PHASE_THREE'))
                 
-            self.last_triple_shot_time = current_time
-            self.triple_shot_interval = random.randint(500, 1000)  # Randomize next interval
+            self.start_timer('movement_5', random.randint(500, 1000))  # Randomize next interval
         
         return new_projectiles
 
     def movement_6(self, player_position):
-        if not hasattr(self, 'last_predictive_shot_time'):
-            self.last_predictive_shot_time = pygame.time.get_ticks()
-            self.predictive_shot_interval = random.randint(800, 1500)
+        if 'movement_6' not in self.timers:
+            self.start_timer('movement_6', random.randint(800, 1500))
 
-        current_time = pygame.time.get_ticks()
         new_projectiles = []
         
         # Use orbital movement similar to movement_5
         orbit_angle = self.orbit_around_point(player_position, orbit_radius=300, rotation_speed=0.02)
         
         # Handle shooting with prediction
-        if current_time - self.last_predictive_shot_time >= self.predictive_shot_interval:
-            # Get player velocity
-            player_velocity = (self.game.player.velocity_x, self.game.player.velocity_y)
-            projectile_speed = ENEMY['PROJECTILE']['PREDICTIVE']['SPEED']
-            
-            # Calculate intercept point
-            predicted_pos = calculate_intercept_point(
-                (self.rect.centerx, self.rect.centery),
-                player_position,
-                player_velocity,
-                projectile_speed
-            )
-            
-            if predicted_pos:
-                # Calculate angle to predicted position
-                dx = predicted_pos[0] - self.rect.centerx
-                dy = predicted_pos[1] - self.rect.centery
-                angle = math.atan2(dy, dx)
-                
-                # Create predictive shot
-                new_projectiles.append(self.shoot(angle, 'PHASE_THREE'))
-            else:
-                # If no intercept possible, shoot directly at player
-                dx = player_position[0] - self.rect.centerx
-                dy = player_position[1] - self.rect.centery
-                angle = math.atan2(dy, dx)
-                new_projectiles.append(self.shoot(angle, 'PHASE_THREE'))
-            
-            self.last_predictive_shot_time = current_time
-            self.predictive_shot_interval = random.randint(800, 1500)
+        if self.timer_expired('movement_6'):
+            # Aimed by the game together with every other predictive shot this tick
+            self.game.predictive_shooters.append(self)
+            self.start_timer('movement_6', random.randint(800, 1500))
         
         return new_projectiles
 
@@ -384,29 +383,36 @@ class Enemy:
         # Ensure radius is at least 1 pixel
         self.radius = max(1, self.radius)
         
-        try:
-            self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, color, (self.radius, self.radius), self.radius)
-            self.rect = self.image.get_rect(center=self.rect.center if self.rect else (0, 0))
-        except pygame.error as e:
-            print(f"Error in update_image: radius = {self.radius}")
-        self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (self.radius, self.radius), self.radius)
+        self.image = get_circle_sprite(self.radius, color)
         self.rect = self.image.get_rect(center=self.rect.center if self.rect else (0, 0))
         
-    def move_towards_player(self, player_position, walls=None):
-        # Get speed multiplier considering both distance and walls
-        speed_multiplier = self.calculate_speed_multiplier(player_position, walls)
+    def chase_direction(self, player_position) -> Tuple[float, float]:
+        """
+        Unit vector to steer along toward the player
+        Follows the game's flow field around walls. Beyond the field it heads
+        for the next door on the room route to the player, and straight for
+        the player where neither has a route, like in the player's own cell.
+        """
+        direction = self.game.flow_field.direction_at(self.rect.center)
+        if direction is not None:
+            return direction
         
-        dx = player_position[0] - self.rect.centerx
-        dy = player_position[1] - self.rect.centery
+        target = self.game.room_planner.waypoint(self.rect.center, player_position) or player_position
+        dx = target[0] - self.rect.centerx
+        dy = target[1] - self.rect.centery
         distance = math.hypot(dx, dy)
+        if distance == 0:
+            return 0.0, 0.0
+        return dx / distance, dy / distance
+    
+    def move_towards_player(self, player_position, level=None):
+        # Get speed multiplier considering both distance and walls
+        speed_multiplier = self.calculate_speed_multiplier(player_position, level)
         
-        if distance > 0:
+        direction_x, direction_y = self.chase_direction(player_position)
+        
+        if direction_x or direction_y:
             # Apply combined speed multiplier
-            direction_x = dx / distance
-            direction_y = dy / distance
-            
             self.velocity_x += direction_x * self.acceleration * speed_multiplier
             self.velocity_y += direction_y * self.acceleration * speed_multiplier
             
@@ -424,25 +430,22 @@ class Enemy:
         self.rect.centerx += int(self.velocity_x)
         self.rect.centery += int(self.velocity_y)
     
-    def sweep_towards_player(self, player_position, walls=None):
-        current_time = pygame.time.get_ticks()
-        
+    def sweep_towards_player(self, player_position, level=None):
         # Get speed multiplier based on distance
-        speed_multiplier = self.calculate_speed_multiplier(player_position, walls)
+        speed_multiplier = self.calculate_speed_multiplier(player_position, level)
         
         # Update sweep direction every few seconds
-        if not hasattr(self, 'last_sweep_change'):
-            self.last_sweep_change = current_time
+        if 'sweep' not in self.timers:
+            self.start_timer('sweep', 2000)
             self.sweep_direction = 1
         
-        if current_time - self.last_sweep_change > 2000:
+        if self.timer_expired('sweep'):
             self.sweep_direction *= -1
-            self.last_sweep_change = current_time
+            self.start_timer('sweep', 2000)
         
-        # Calculate angle to player
-        dx = player_position[0] - self.rect.centerx
-        dy = player_position[1] - self.rect.centery
-        angle_to_player = math.atan2(dy, dx)
+        # Calculate angle to player, around walls in the way
+        direction_x, direction_y = self.chase_direction(player_position)
+        angle_to_player = math.atan2(direction_y, direction_x)
         
         # Calculate sweep offset
         sweep_offset = ENEMY['MOVEMENT']['SWEEP']['AMPLITUDE'] * self.sweep_direction
@@ -466,11 +469,11 @@ class Enemy:
         self.rect.x += self.velocity_x
         self.rect.y += self.velocity_y
     
-    def dash_toward_player(self, player_position, walls=None):
-        current_time = pygame.time.get_ticks()
+    def dash_toward_player(self, player_position, level=None):
+        current_time = self.clock.get_ticks()
         
         # Get speed multiplier based on distance
-        speed_multiplier = self.calculate_speed_multiplier(player_position, walls)
+        speed_multiplier = self.calculate_speed_multiplier(player_position, level)
         
         if self.dashing:
             # Reset radius to normal when dashing
@@ -479,13 +482,11 @@ class Enemy:
                 self.update_image()
                 delattr(self, 'original_radius')
             
-            # Calculate direction to player
-            dx = player_position[0] - self.rect.centerx
-            dy = player_position[1] - self.rect.centery
-            distance = math.hypot(dx, dy)
-            target_angle = math.atan2(dy, dx)
+            # Calculate direction to player, around walls in the way
+            direction_x, direction_y = self.chase_direction(player_position)
+            target_angle = math.atan2(direction_y, direction_x)
             
-            if distance > 0:
+            if direction_x or direction_y:
                 # Initialize current_angle if it doesn't exist
                 if not hasattr(self, 'current_angle'):
                     self.current_angle = target_angle
@@ -513,18 +514,17 @@ class Enemy:
                     self.velocity_x *= scale
                     self.velocity_y *= scale
             
-            if current_time - self.last_dash_time >= ENEMY['MOVEMENT']['DASH']['DURATION']:
+            if self.timer_expired('dash'):
                 self.dashing = False
                 self.last_dash_time = current_time
+                self.start_timer('dash', ENEMY['MOVEMENT']['DASH']['PAUSE_DURATION'])
                 self.dash_indicator_shown = False
         else:
             # During pause: face directly towards player (no turn limit)
-            dx = player_position[0] - self.rect.centerx
-            dy = player_position[1] - self.rect.centery
-            distance = math.hypot(dx, dy)
+            direction_x, direction_y = self.chase_direction(player_position)
             
-            if distance > 0:
-                self.current_angle = math.atan2(dy, dx)  # Freely update angle during pause
+            if direction_x or direction_y:
+                self.current_angle = math.atan2(direction_y, direction_x)  # Freely update angle during pause
             
             # Check if the dash indicator has been shown
             if not self.dash_indicator_shown:
@@ -574,9 +574,10 @@ class Enemy:
                 self.velocity_y = min(0, self.velocity_y + decel)
             
             # Switch back to dashing after pause duration
-            if current_time - self.last_dash_time >= ENEMY['MOVEMENT']['DASH']['PAUSE_DURATION']:
+            if self.timer_expired('dash'):
                 self.dashing = True
                 self.last_dash_time = current_time
+                self.start_timer('dash', ENEMY['MOVEMENT']['DASH']['DURATION'])
         
         # Update position using velocity
         self.rect.centerx += int(self.velocity_x)
@@ -592,7 +593,7 @@ class Enemy:
                 self.radius = 0
                 # Optionally set a flag to indicate the enemy is destroyed
 
-    def calculate_wall_overlap(self, walls: List[pygame.Rect]) -> float:
+    def calculate_wall_overlap(self, level) -> float:
         """
         Calculate how much of the enemy is overlapping with walls.
         Returns a value between 0 (no overlap) and 1 (full overlap).
@@ -608,20 +609,19 @@ class Enemy:
         max_overlap_area = math.pi * self.radius * self.radius  # Total circle area
         total_overlap = 0
         
-        for wall in walls:
-            if enemy_rect.colliderect(wall):
-                # Calculate overlap rectangle
-                overlap_rect = enemy_rect.clip(wall)
-                
-                # For simplicity, we'll use the rectangle overlap area
-                # This is an approximation since we're actually a circle
-                overlap_area = overlap_rect.width * overlap_rect.height
-                total_overlap += overlap_area
+        for wall in level.walls_overlapping(enemy_rect):
+            # Calculate overlap rectangle
+            overlap_rect = enemy_rect.clip(wall)
+            
+            # For simplicity, we'll use the rectangle overlap area
+            # This is an approximation since we're actually a circle
+            overlap_area = overlap_rect.width * overlap_rect.height
+            total_overlap += overlap_area
         
         # Return ratio of overlap (capped at 1.0)
         return min(total_overlap / max_overlap_area, 1.0)
 
-    def calculate_speed_multiplier(self, player_position, walls: List[pygame.Rect] = None):
+    def calculate_speed_multiplier(self, player_position, level=None):
         """
         Calculate speed multiplier based on distance to player and wall overlap.
         """
@@ -631,12 +631,12 @@ class Enemy:
         distance = math.hypot(dx, dy)
         distance_multiplier = 1.0  # Default multiplier
         
-        # If no walls provided, just return distance multiplier
-        if not walls:
+        # If no level provided, just return distance multiplier
+        if not level:
             return distance_multiplier
             
         # Calculate wall overlap
-        wall_overlap = self.calculate_wall_overlap(walls)
+        wall_overlap = self.calculate_wall_overlap(level)
         
         # Amplify small wall_overlap values (e.g., ^0.5 makes 0.2 become ~0.447)
         wall_overlap = pow(wall_overlap, 0.5)  # Square root makes small values larger
@@ -679,22 +679,22 @@ class SplitEnemy(Enemy):
             self.current_phase = 2
         
         self.state = random.choice(self.phase_states[self.current_phase])
-        self.last_state_change = pygame.time.get_ticks()
-        self.next_state_change = random.randint(3000, 8000)
+        # Split enemies keep the state they were split into
+        self.state_timer.cancel()
         
         # Update image with appropriate color
         self.update_image()
 
-    def move(self, player_position, walls=None):
+    def move(self, player_position, level=None):
         """Override move method to ensure split enemies maintain their specific movesets"""
         if self.enemy_type == 'phase1':
             # Phase 1 movements only
             if self.state == "move_towards_player":
-                self.move_towards_player(player_position, walls)
+                self.move_towards_player(player_position, level)
             elif self.state == "sweep_towards_player":
-                self.sweep_towards_player(player_position, walls)
+                self.sweep_towards_player(player_position, level)
             elif self.state == "dash_toward_player":
-                self.dash_toward_player(player_position, walls)
+                self.dash_toward_player(player_position, level)
             return []  # Phase 1 doesn't shoot projectiles
         else:
             # Phase 2 movements only
@@ -707,21 +707,6 @@ class SplitEnemy(Enemy):
                 new_projectiles = self.movement_6(player_position)
             return new_projectiles
 
-    def update_state(self):
-        """Override update_state to ensure split enemies maintain their specific states"""
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_state_change >= self.next_state_change:
-            old_state = self.state
-            self.state = random.choice(self.phase_states[self.current_phase])
-            if old_state != self.state:
-                # Create movement change effect
-                self.game.effect_manager.create_movement_change_effect(
-                    self.rect.centerx,
-                    self.rect.centery
-                )
-            self.last_state_change = current_time
-            self.next_state_change = random.randint(3000, 8000)
-
     def update_image(self, color=None):
         if color is None:
             # Check if enemy_type is defined before using it
@@ -730,8 +715,7 @@ class SplitEnemy(Enemy):
             else:
                 color = COLORS['RED']  # Fallback color if enemy_type is not set
         
-        self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (self.radius, self.radius), self.radius)
+        self.image = get_circle_sprite(self.radius, color)
         self.rect = self.image.get_rect(center=self.rect.center if self.rect else (0, 0))
 
     def take_damage(self, damage):
@@ -55,7 +55,7 @@ class Player:
         
         return base_speed
 
-    def move(self, visible_walls):
+    def move(self, level=None):
         # Decrease stamina bar visibility counter
         if self.stamina_bar_visible > 0:
             self.stamina_bar_visible -= 1
@@ -100,9 +100,11 @@ class Player:
         self.rect.x += self.velocity_x
         self.rect.y += self.velocity_y
         
-        # Check and resolve wall collisions
-        if visible_walls:
-            self.rect = resolve_wall_collision(old_pos, self.rect, visible_walls)
+        # Check and resolve wall collisions against walls along the swept path
+        if level:
+            walls = level.walls_overlapping(old_pos.union(self.rect))
+            if walls:
+                self.rect = resolve_wall_collision(old_pos, self.rect, walls)
 
     def shoot(self, camera_pos):
         x, y, using_controller = self.controls.get_aim_vector()
@@ -148,10 +150,10 @@ class Player:
     def die(self):
         self.died = 1
         
-    def draw_stamina_bar(self, surface, camera):
+    def draw_stamina_bar(self, surface, camera, rect=None):
         if self.stamina_bar_visible > 0:
             # Get screen position using camera
-            screen_pos = camera.apply(self.rect)
+            screen_pos = camera.apply(rect or self.rect)
             
             # Bar dimensions
             bar_width = PLAYER['STAMINA']['BAR']['WIDTH']
@@ -170,13 +172,14 @@ class Player:
                 fill_color = COLORS['RED']
             pygame.draw.rect(surface, fill_color, (bar_x, bar_y, fill_width, bar_height))
 
-    def draw_health_bar(self, surface, camera):
+    def draw_health_bar(self, surface, camera, rect=None):
         if self.current_health < self.max_health:
             # Bar dimensions
             bar_width = 50
             bar_height = 6
-            bar_x = camera.apply(self.rect).centerx - bar_width // 2
-            bar_y = camera.apply(self.rect).top - 20  # Position above stamina bar
+            screen_pos = camera.apply(rect or self.rect)
+            bar_x = screen_pos.centerx - bar_width // 2
+            bar_y = screen_pos.top - 20  # Position above stamina bar
 
             # Background (empty) bar
             pygame.draw.rect(surface, COLORS['BLACK'], (bar_x, bar_y, bar_width, bar_height))
@@ -0,0 +1,157 @@
+from typing import Iterable
+
+import numpy as np
+
+from src.constants import WINDOW
+
+# Color keys a projectile can be drawn with, stored as an index per projectile
+COLOR_KEYS = ('PROJECTILE', 'RED', 'PURPLE', 'DARK_PURPLE')
+
+class ProjectileBuffer:
+    """
+    Structure-of-arrays store for every live projectile.
+
+    Each attribute lives in its own contiguous NumPy array and slot i of every
+    array belongs to the same projectile. Movement and culling run as single
+    vectorized steps, and projectiles are removed by clearing their `alive`
+    flag; dead slots are dropped in one pass by compact().
+
+    Wall collisions are not tested per tick. Each projectile is ray-cast once
+    and stores the tick and point of its wall impact; `hit` is False when the
+    cast found no wall within range and only marks when to cast again.
+    """
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'prev_x': np.float64,  # Position before the last move, for render interpolation
+        'prev_y': np.float64,
+        'vx': np.float64,
+        'vy': np.float64,
+        'radius': np.float64,
+        'damage': np.float64,
+        'shrink_rate': np.float64,
+        'min_size': np.float64,
+        'from_enemy': np.bool_,
+        'color': np.int8,
+        'alive': np.bool_,
+        'impact_tick': np.int64,
+        'impact_x': np.float64,
+        'impact_y': np.float64,
+        'impact_normal': np.float64,
+        'hit': np.bool_,
+        'pending': np.bool_,  # Cast crossed chunks that were not generated yet
+    }
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.tick = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _grow(self, needed: int):
+        """Double capacity until `needed` slots fit, keeping existing data"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, dtype in self.FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def append(self, projectile):
+        """Pack a Projectile into the next free slot"""
+        if self.count >= self.capacity:
+            self._grow(self.count + 1)
+        i = self.count
+        self.x[i], self.y[i] = projectile.pos
+        self.prev_x[i], self.prev_y[i] = projectile.pos
+        self.vx[i], self.vy[i] = projectile.velocity
+        self.radius[i] = projectile.radius
+        self.damage[i] = projectile.damage
+        self.shrink_rate[i] = projectile.shrink_rate
+        self.min_size[i] = projectile.min_size
+        self.from_enemy[i] = projectile.from_enemy
+        self.color[i] = COLOR_KEYS.index(projectile.color_key)
+        self.alive[i] = True
+        # Due for its first cast right away
+        self.impact_tick[i] = self.tick
+        self.hit[i] = False
+        self.pending[i] = False
+        self.count += 1
+
+    def extend(self, projectiles: Iterable):
+        for projectile in projectiles:
+            self.append(projectile)
+
+    def clear(self):
+        self.count = 0
+
+    def live_indices(self) -> np.ndarray:
+        """Indices of all projectiles that are still alive"""
+        return np.flatnonzero(self.alive[:self.count])
+
+    def move(self):
+        """Advance every projectile by its velocity"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.tick += 1
+
+    def schedule_cast(self, index):
+        """Mark projectiles (index, indices or mask) to be ray-cast again"""
+        self.impact_tick[:self.count][index] = self.tick
+        self.hit[:self.count][index] = False
+
+    def due(self, hit: bool) -> np.ndarray:
+        """Indices of live projectiles due for a wall impact (hit) or a new cast"""
+        n = self.count
+        mask = self.alive[:n] & (self.impact_tick[:n] <= self.tick) & (self.hit[:n] == hit)
+        return np.flatnonzero(mask)
+
+    def circle_hits(self, center, radius: float, from_enemy: bool) -> np.ndarray:
+        """Indices of live projectiles from the given side overlapping a circle"""
+        n = self.count
+        dx = self.x[:n] - center[0]
+        dy = self.y[:n] - center[1]
+        reach = self.radius[:n] + radius
+        mask = (self.alive[:n] & (self.from_enemy[:n] == from_enemy) &
+                (dx * dx + dy * dy < reach * reach))
+        return np.flatnonzero(mask)
+
+    def shrink(self, index: int):
+        """Shrink a projectile after a hit and kill it once it gets too small"""
+        self.radius[index] *= self.shrink_rate[index]
+        if self.radius[index] <= self.min_size[index]:
+            self.alive[index] = False
+        else:
+            # A smaller projectile reaches walls later
+            self.schedule_cast(index)
+
+    def cull_off_screen(self, camera):
+        """Kill every projectile whose bounding box left the camera view"""
+        n = self.count
+        radius = self.radius[:n]
+        screen_x = self.x[:n] - radius - camera.x
+        screen_y = self.y[:n] - radius - camera.y
+        off_screen = ((screen_x > WINDOW['WIDTH']) | (screen_x + radius * 2 < 0) |
+                      (screen_y > WINDOW['HEIGHT']) | (screen_y + radius * 2 < 0))
+        self.alive[:n] &= ~off_screen
+
+    def compact(self):
+        """Drop dead projectiles by packing live slots to the front"""
+        n = self.count
+        keep = self.alive[:n].copy()
+        live = int(np.count_nonzero(keep))
+        if live == n:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:live] = array[:n][keep]
+        self.count = live
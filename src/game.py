@@ -1,6 +1,9 @@
+import os
 import random
 import math
+import time
 
+import numpy as np
 import pygame
 from pygame.locals import *
 
@@ -10,54 +13,95 @@ from src.constants import (
     LEVEL,
     ITEMS,
     PLAYER,
-    ENEMY
+    ENEMY,
+    COLLISION,
+    SIMULATION
 )
 from src.camera import Camera
+from src.clock import GameClock
+from src.scheduler import Scheduler
 from src.entities.enemy import Enemy
 from src.entities.player import Player
-from src.entities.projectile import Projectile
+from src.entities.projectile_buffer import ProjectileBuffer, COLOR_KEYS as PROJECTILE_COLOR_KEYS
 from src.items.item import Item
+from src.items.spawn_sampler import SpawnSampler
 from src.level_generator import LevelGenerator
+from src.navigation.flow_field import FlowField
+from src.navigation.room_planner import RoomPlanner
+from src.wall_layer import WallLayerCache
+from src.world_view import WorldView
+from src.utils.spatial_hash import SpatialHash
+from src.utils.sprite_cache import get_circle_sprite
+from src.utils.prediction import calculate_intercept_points
 from src.utils.collision import (
     handle_projectile_enemy_collision,
     handle_projectile_player_collision,
     handle_player_enemy_collision,
     handle_projectile_projectile_collision,
     handle_item_player_collision,
-    handle_projectile_wall_collision
+    handle_projectile_wall_collision,
+    cast_projectile
 )
 from src.effects.effect_manager import EffectManager
 from src.settings import Settings
 from src.menu import Menu
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless: bool = False, world_path: str = None):
+        """
+        headless: Run the simulation only, without a window, fonts or menus.
+                  Use run_headless() to drive it.
+        world_path: World file to keep generated chunks in across runs
+        """
+        self.headless = headless
+        self.world_path = world_path
+        if headless:
+            # pygame input queries still need a video driver, just not a real one
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
         pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW['WIDTH'], WINDOW['HEIGHT']))
+        self.screen = None if headless else pygame.display.set_mode((WINDOW['WIDTH'], WINDOW['HEIGHT']))
         self.clock = pygame.time.Clock()
+        self.game_clock = GameClock()
+        self.scheduler = Scheduler(self.game_clock)
         self.running = True
         self.settings = Settings()
         
         # Add menu states
         self.state = "START_MENU"
-        self.menu = Menu(self.screen, self.settings)
+        self.menu = None
         self.setup_menus()
         
         # Game objects (only initialize when starting game)
         self.player = None
         self.enemy = None
-        self.projectiles = []
+        self.projectiles = ProjectileBuffer()
+        self.projectile_grid = None
         self.items = []
+        self.predictive_shooters = []
         self.level_generator = None
+        self.level_version = 0
+        self.wall_layers = None
         self.camera = None
+        self.world_view = None
         self.effect_manager = None
 
     def update(self):
-        """Main game update loop"""
+        """Advance the game by one fixed tick"""
         if not self.player.died:
-            visible_walls = self.level_generator.get_visible_walls(self.camera.x, self.camera.y)
+            # Sample game time once, every timer read during this tick sees the same value
+            self.game_clock.tick()
+            self.scheduler.run_due()
+            self.store_previous_positions()
             
-            self.player.move(visible_walls)
+            if self.player.controls.is_shooting():
+                projectile = self.player.shoot((self.camera.x, self.camera.y))
+                self.projectiles.append(projectile)
+            
+            self.player.move(self.level_generator)
+            # Enemies steer along the field, so it follows the player first
+            self.flow_field.update(self.player.rect.center)
+            self.room_planner.update()
             
             # Check for victory condition
             if not self.enemy and not getattr(self, 'split_enemies', []):
@@ -67,38 +111,95 @@ class Game:
             
             # Handle either main enemy or split enemies
             if self.enemy:
-                new_projectiles = self.enemy.move(self.player.rect.center, visible_walls)
+                new_projectiles = self.enemy.move(self.player.rect.center, self.level_generator)
                 if new_projectiles:
                     self.projectiles.extend(new_projectiles)
                 # Check player-enemy collision with main enemy
                 handle_player_enemy_collision(self.player, self.enemy)
             elif self.split_enemies:
                 for split_enemy in self.split_enemies:
-                    new_projectiles = split_enemy.move(self.player.rect.center, visible_walls)
+                    new_projectiles = split_enemy.move(self.player.rect.center, self.level_generator)
                     if new_projectiles:
                         self.projectiles.extend(new_projectiles)
                     # Check player-enemy collision with each split enemy
                     handle_player_enemy_collision(self.player, split_enemy)
+            self.fire_predictive_shots()
             
             self.update_items()
             self.spawn_items()
             self.update_projectiles()
             
             self.camera.update(self.player.rect)
+            self.world_view.update(self.camera)
             self.level_generator.update(self.camera.x, self.camera.y)
             self.effect_manager.update()
+        
+        if self.player.died:
+            self.state = "GAME_OVER"
+            self.setup_menus()
 
     def run(self):
+        """
+        Run update() at the fixed SIMULATION tick rate and render as often as
+        WINDOW['FPS'] allows, drawing in between the last two ticks
+        """
+        max_frame_time = SIMULATION['MAX_STEPS_PER_FRAME'] / SIMULATION['TICK_RATE']
+        previous_time = time.perf_counter()
+        
         while self.running:
+            current_time = time.perf_counter()
+            # Drop time beyond the catch-up limit instead of spiralling after a stall
+            frame_time = min(current_time - previous_time, max_frame_time)
+            previous_time = current_time
+            
             self.handle_events()
             
             if self.state == "PLAYING":
-                self.update()
-                self.render()
+                for _ in range(self.game_clock.accumulate(frame_time)):
+                    self.update()
+                    if self.state != "PLAYING":
+                        break
+                self.render(self.game_clock.interpolation)
             else:
+                self.menu.clock.advance(frame_time)
                 self.menu.render()
+                # Start the next game from a clean tick
+                self.game_clock.reset_accumulator()
                 
             self.clock.tick(WINDOW['FPS'])
+        
+        self.shutdown()
+
+    def run_headless(self, ticks: int = None, duration: float = None) -> int:
+        """
+        Simulate a game as fast as possible without rendering
+        Stops after `ticks` updates, after `duration` seconds of wall time,
+        or when the game ends, whichever comes first.
+        Returns the number of ticks simulated.
+        """
+        if ticks is None and duration is None:
+            raise ValueError("run_headless needs a tick budget or a duration")
+        
+        self.start_game()
+        deadline = None if duration is None else time.perf_counter() + duration
+        tick = 0
+        while self.running and self.state == "PLAYING":
+            if ticks is not None and tick >= ticks:
+                break
+            # Checking the clock every tick would cost more than the tick itself
+            if deadline is not None and tick % 64 == 0 and time.perf_counter() >= deadline:
+                break
+            pygame.event.pump()
+            self.update()
+            tick += 1
+        
+        self.shutdown()
+        return tick
+
+    def shutdown(self):
+        """Stop background work, the chunk generation processes"""
+        if self.level_generator:
+            self.level_generator.shutdown()
 
     def handle_events(self):
         """Event handler"""
@@ -117,12 +218,11 @@ class Game:
             if self.player:
                 if self.player.controls.get_menu_press():
                     self.settings.toggle_dark_mode()
-                if self.player.controls.is_shooting():
-                    projectile = self.player.shoot((self.camera.x, self.camera.y))
-                    self.projectiles.append(projectile)
 
     def setup_menus(self):
         """Initialize different menu configurations"""
+        if self.headless:
+            return
         if self.state == "START_MENU":
             self.menu = Menu(self.screen, self.settings)
             self.menu.set_title("grep")
@@ -145,209 +245,207 @@ class Game:
     def start_game(self):
         """Initialize or reset the game state"""
         self.state = "PLAYING"
+        # Fresh game time first, entities take the clock on creation
+        self.game_clock = GameClock()
+        self.scheduler = Scheduler(self.game_clock)
         self.player = Player(self)
         self.enemy = Enemy(self)
-        self.projectiles = []
+        self.projectiles = ProjectileBuffer()
+        self.projectile_grid = SpatialHash(COLLISION['GRID_CELL_SIZE'])
         self.items = []
-        self.level_generator = LevelGenerator(WINDOW['WIDTH'], WINDOW['HEIGHT'])
+        self.predictive_shooters = []
+        if self.level_generator:
+            self.level_generator.shutdown()
+        self.level_generator = LevelGenerator(WINDOW['WIDTH'], WINDOW['HEIGHT'],
+                                              world_path=self.world_path)
+        self.level_version = self.level_generator.version
+        self.flow_field = FlowField(self.level_generator)
+        self.item_sampler = SpawnSampler(self.level_generator)
+        self.item_grid = SpatialHash(ITEMS['SPAWN']['MIN_DISTANCE'])
+        self.room_planner = RoomPlanner(self.level_generator)
+        self.wall_layers = WallLayerCache(self.level_generator.chunk_size)
         self.camera = Camera()
+        self.world_view = WorldView(self.level_generator)
+        self.world_view.update(self.camera)
         self.effect_manager = EffectManager()
 
         self.item_spawn_chance = ITEMS['SPAWN']['CHANCE']
 
+    def store_previous_positions(self):
+        """Remember where entities were before this tick so rendering can interpolate"""
+        for entity in [self.player, self.enemy, *getattr(self, 'split_enemies', [])]:
+            if entity:
+                entity.previous_pos = entity.rect.topleft
+
+    def interpolated_rect(self, entity, t: float) -> pygame.Rect:
+        """Get the entity's rect placed t of the way from its previous to its current position"""
+        rect = entity.rect.copy()
+        previous_pos = getattr(entity, 'previous_pos', None)
+        if previous_pos:
+            rect.x = round(previous_pos[0] + (rect.x - previous_pos[0]) * t)
+            rect.y = round(previous_pos[1] + (rect.y - previous_pos[1]) * t)
+        return rect
+
     def quit_game(self):
         """Exit the game"""
         self.running = False
 
     def update_projectiles(self):
         """Update all projectiles and handle collisions"""
-        visible_walls = self.level_generator.get_visible_walls(self.camera.x, self.camera.y)
+        projectiles = self.projectiles
+        projectiles.move()
         
-        i = 0
-        while i < len(self.projectiles):
-            projectile = self.projectiles[i]
-            projectile.move()
-            
-            # Check collision with walls
-            for wall in visible_walls:
-                if handle_projectile_wall_collision(projectile, wall, self):
+        # Casts that crossed missing chunks are redone once new chunks arrive
+        if self.level_generator.version != self.level_version:
+            self.level_version = self.level_generator.version
+            projectiles.schedule_cast(projectiles.pending[:projectiles.count])
+        
+        # Ray-cast new projectiles against the walls once, then retire the
+        # ones whose wall impact is due this tick
+        for index in projectiles.due(hit=False):
+            cast_projectile(projectiles, index, self.level_generator)
+        handle_projectile_wall_collision(projectiles, self.effect_manager)
+        
+        # Rebuild the broadphase grid with enemy projectiles only, so each
+        # player projectile is tested against nearby enemy projectiles
+        count = projectiles.count
+        xs = projectiles.x[:count].tolist()
+        ys = projectiles.y[:count].tolist()
+        from_enemy = projectiles.from_enemy[:count]
+        self.projectile_grid.clear()
+        for index in np.flatnonzero(projectiles.alive[:count] & from_enemy).tolist():
+            self.projectile_grid.insert(index, xs[index], ys[index])
+        
+        # Check collision between player and enemy projectiles
+        for index in np.flatnonzero(projectiles.alive[:count] & ~from_enemy).tolist():
+            for other_index in self.projectile_grid.nearby(xs[index], ys[index]):
+                if (projectiles.alive[other_index] and
+                        handle_projectile_projectile_collision(projectiles, index, other_index)):
+                    projectiles.alive[index] = False
+                    projectiles.shrink(other_index)
                     break
-            
-            # Check collision with other projectiles
-            j = 0
-            while j < len(self.projectiles):
-                if i != j:  # Don't compare projectile with itself
-                    other_projectile = self.projectiles[j]
-                    if (not projectile.from_enemy and 
-                        other_projectile.from_enemy and 
-                        handle_projectile_projectile_collision(projectile, other_projectile)):
-                        # Handle projectile collision
-                        if projectile in self.projectiles:
-                            self.projectiles.remove(projectile)
-                            i -= 1
-                        other_projectile.radius *= other_projectile.shrink_rate
-                        if other_projectile.radius <= other_projectile.min_size:
-                            if other_projectile in self.projectiles:
-                                self.projectiles.remove(other_projectile)
-                                if j < i:
-                                    i -= 1
-                        else:
-                            other_projectile.update_rect_size()
-                        break
-                j += 1
-            
-            # Skip remaining checks if projectile was removed
-            if projectile not in self.projectiles:
-                i += 1
-                continue
-            
-            # Check collision with enemies (if player projectile)
-            if not projectile.from_enemy:
-                hit_enemy = False
-                if self.enemy:
-                    if handle_projectile_enemy_collision(projectile, self.enemy, self.effect_manager):
-                        hit_enemy = True
-                elif self.split_enemies:
-                    for split_enemy in self.split_enemies[:]:  # Use slice copy to safely modify during iteration
-                        if handle_projectile_enemy_collision(projectile, split_enemy, self.effect_manager):
-                            hit_enemy = True
-                            # Remove split enemy if health depleted
-                            if split_enemy.current_health <= 0:
-                                self.split_enemies.remove(split_enemy)
-                            break
-                
-                if hit_enemy and projectile in self.projectiles:
-                    self.projectiles.remove(projectile)
-                    continue
-            
-            # Check collision with player (if enemy projectile)
-            if projectile.from_enemy:
-                should_remove = handle_projectile_player_collision(projectile, self.player)
-                if should_remove and projectile in self.projectiles:
-                    self.projectiles.remove(projectile)
-                    continue
-            
-            # Remove if off screen
-            if projectile.is_off_screen(self.camera):
-                if projectile in self.projectiles:
-                    self.projectiles.remove(projectile)
-            i += 1
+        
+        # Check collision with enemies (player projectiles)
+        if self.enemy:
+            handle_projectile_enemy_collision(projectiles, self.enemy, self.effect_manager)
+        elif self.split_enemies:
+            for split_enemy in self.split_enemies[:]:  # Use slice copy to safely modify during iteration
+                if handle_projectile_enemy_collision(projectiles, split_enemy, self.effect_manager):
+                    # Remove split enemy if health depleted
+                    if split_enemy.current_health <= 0:
+                        self.split_enemies.remove(split_enemy)
+        
+        # Check collision with player (enemy projectiles)
+        handle_projectile_player_collision(projectiles, self.player)
+        
+        # Remove if off screen, then drop every dead projectile at once
+        projectiles.cull_off_screen(self.camera)
+        projectiles.compact()
 
     def update_items(self):
         for item in self.items[:]:
             item.update()
             if handle_item_player_collision(item, self.player):
                 item.apply_effect(self.player)
-                self.items.remove(item)
-            elif item.should_despawn(self.camera):
-                self.items.remove(item)
+                item.despawn_timer.cancel()
+                self.remove_item(item)
+            elif item.should_despawn(self.world_view):
+                self.remove_item(item)
                 
+    def fire_predictive_shots(self):
+        """Aim every predictive shot enemies asked for this tick with one batched intercept solve"""
+        shooters = self.predictive_shooters
+        if not shooters:
+            return
+        origins = np.array([shooter.rect.center for shooter in shooters], dtype=np.float64)
+        points, _ = calculate_intercept_points(
+            origins,
+            self.player.rect.center,
+            (self.player.velocity_x, self.player.velocity_y),
+            ENEMY['PROJECTILE']['PREDICTIVE']['SPEED']
+        )
+        # Shots without an intercept get the player's position, so they go straight at the player
+        angles = np.arctan2(points[:, 1] - origins[:, 1], points[:, 0] - origins[:, 0])
+        for shooter, angle in zip(shooters, angles.tolist()):
+            self.projectiles.append(shooter.shoot(angle, 'PHASE_THREE'))
+        shooters.clear()
+    
+    def remove_item(self, item):
+        self.items.remove(item)
+        self.item_grid.remove(item, *item.rect.center)
+    
     def spawn_items(self):
         if random.random() < self.item_spawn_chance:
-            current_chunk = self.level_generator.get_chunk_coords(self.camera.x, self.camera.y)
-            
-            # Randomly select a chunk within the generation radius
-            chunk_x = random.randint(
-                current_chunk[0] - LEVEL['CHUNK_GENERATION_RADIUS'],
-                current_chunk[0] + LEVEL['CHUNK_GENERATION_RADIUS']
-            )
-            chunk_y = random.randint(
-                current_chunk[1] - LEVEL['CHUNK_GENERATION_RADIUS'],
-                current_chunk[1] + LEVEL['CHUNK_GENERATION_RADIUS']
-            )
-            
-            chunk_coords = (chunk_x, chunk_y)
-            if chunk_coords not in self.level_generator.chunks:
-                return
+            current_chunk = self.world_view.camera_chunk
+            radius = LEVEL['CHUNK_GENERATION_RADIUS']
             
-            chunk_world_x = chunk_x * WINDOW['WIDTH']
-            chunk_world_y = chunk_y * WINDOW['HEIGHT']
-            
-            # Try to find a valid spawn position
-            max_attempts = 10
-            for _ in range(max_attempts):
-                padding = 20
-                random_pos = (
-                    random.randint(int(chunk_world_x + padding), 
-                                 int(chunk_world_x + WINDOW['WIDTH'] - padding)),
-                    random.randint(int(chunk_world_y + padding), 
-                                 int(chunk_world_y + WINDOW['HEIGHT'] - padding))
-                )
-                
-                # Check if position is too close to other items
-                too_close = False
-                for item in self.items:
-                    dx = random_pos[0] - item.rect.centerx
-                    dy = random_pos[1] - item.rect.centery
-                    distance = (dx * dx + dy * dy) ** 0.5
-                    if distance < item.occupied_space:
-                        too_close = True
-                        break
-                
-                # Check if position collides with walls
-                test_rect = pygame.Rect(
-                    random_pos[0] - padding,
-                    random_pos[1] - padding,
-                    padding * 2,
-                    padding * 2
-                )
-                wall_collision = False
-                for wall in self.level_generator.chunks[chunk_coords]:
-                    if wall.colliderect(test_rect):
-                        wall_collision = True
-                        break
-                    
-                if not too_close and not wall_collision:
-                    self.items.append(Item(random_pos))
-                    # print(f"Spawned stamina item at position {random_pos}")
-                    break
+            # Any chunk within the generation radius, weighted by its free space
+            chunks = [
+                (current_chunk[0] + dx, current_chunk[1] + dy)
+                for dx in range(-radius, radius + 1)
+                for dy in range(-radius, radius + 1)
+            ]
+            position = self.item_sampler.sample(chunks, self.item_grid)
+            if position is not None:
+                item = Item(position, self.scheduler)
+                self.items.append(item)
+                self.item_grid.insert(item, *position)
 
-    def render(self):
+    def render(self, interpolation: float = 1.0):
+        """
+        Draw the current game state
+        interpolation: How far between the previous and the current tick to draw
+                       moving objects, 1.0 draws the current tick as is
+        """
         self.screen.fill(COLORS['WHITE'])
+        camera = self.camera.interpolated(interpolation)
         
-        # Get only the visible walls
-        visible_walls = self.level_generator.get_visible_walls(self.camera.x, self.camera.y)
-        
-        # Draw visible walls
-        for wall in visible_walls:
-            wall_rect = self.camera.apply(wall)
-            pygame.draw.rect(self.screen, COLORS['BLACK'], wall_rect)
+        # Draw the pre-rendered wall layer of each chunk on screen
+        self.wall_layers.draw(self.screen, camera, self.world_view)
         
         # Apply camera offset to player
-        player_rect = self.camera.apply(self.player.rect)
+        player_world_rect = self.interpolated_rect(self.player, interpolation)
+        player_rect = camera.apply(player_world_rect)
         
         # Draw either main enemy or split enemies
         if self.enemy:
-            enemy_rect = self.camera.apply(self.enemy.rect)
+            enemy_rect = camera.apply(self.interpolated_rect(self.enemy, interpolation))
             self.screen.blit(self.enemy.image, enemy_rect)
         elif self.split_enemies:
             for split_enemy in self.split_enemies:
-                split_enemy_rect = self.camera.apply(split_enemy.rect)
+                split_enemy_rect = camera.apply(self.interpolated_rect(split_enemy, interpolation))
                 self.screen.blit(split_enemy.image, split_enemy_rect)
         
         # Draw player
         self.screen.blit(self.player.image, player_rect)
         
         # Draw stamina bar
-        self.player.draw_stamina_bar(self.screen, self.camera)
+        self.player.draw_stamina_bar(self.screen, camera, player_world_rect)
         # draw health bar
-        self.player.draw_health_bar(self.screen, self.camera)
+        self.player.draw_health_bar(self.screen, camera, player_world_rect)
         
         # Draw projectiles
-        for projectile in self.projectiles:
-            proj_rect = self.camera.apply(projectile.rect)
-            self.screen.blit(projectile.image, proj_rect)
+        projectiles = self.projectiles
+        count = projectiles.count
+        offset_x = int(camera.x)
+        offset_y = int(camera.y)
+        xs = projectiles.prev_x[:count] + (projectiles.x[:count] - projectiles.prev_x[:count]) * interpolation
+        ys = projectiles.prev_y[:count] + (projectiles.y[:count] - projectiles.prev_y[:count]) * interpolation
+        self.screen.blits([
+            (get_circle_sprite(radius, COLORS[PROJECTILE_COLOR_KEYS[color]]),
+             (x - radius - offset_x, y - radius - offset_y))
+            for x, y, radius, color in zip(xs.tolist(),
+                                           ys.tolist(),
+                                           projectiles.radius[:count].tolist(),
+                                           projectiles.color[:count].tolist())
+        ], False)
         
         # Draw items    
         for item in self.items:
-            item_rect = self.camera.apply(item.rect)
+            item_rect = camera.apply(item.rect)
             self.screen.blit(item.image, item_rect)
         
         # Draw effects after game objects so they appear on top
-        self.effect_manager.draw(self.screen, self.camera.x, self.camera.y)
-        
-        if self.player.died:
-            self.state = "GAME_OVER"
-            self.setup_menus()
+        self.effect_manager.draw(self.screen, camera.x, camera.y, interpolation)
         
         pygame.display.update()
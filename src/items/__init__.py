@@ -3,5 +3,6 @@ Collectible items and power-ups.
 """
 
 from .item import Item
+from .spawn_sampler import SpawnSampler
 
-__all__ = ['Item'] 
\ No newline at end of file
+__all__ = ['Item', 'SpawnSampler'] 
\ No newline at end of file
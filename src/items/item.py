@@ -1,35 +1,34 @@
 import math
 import random
 
-import pygame
-
 from src.constants import (
-    WINDOW,
     COLORS,
     ITEMS,
     PLAYER
 )
+from src.utils.sprite_cache import get_circle_sprite
 
 class Item:
-    def __init__(self, position, item_type="stamina", size=20):
+    def __init__(self, position, scheduler, item_type="stamina", size=20):
         """
         Initialize an item
         
         Args:
             position (tuple): (x, y) coordinates for item spawn
+            scheduler (Scheduler): Game scheduler that expires the item after its lifetime
             item_type (str): Type of item ("stamina", etc.)
             size (int): Radius of the item
         """
         self.item_type = item_type
         self.size = size
-        self.spawn_time = pygame.time.get_ticks()
         self.lifetime = ITEMS['LIFETIME']
+        self.expired = False
+        self.despawn_timer = scheduler.schedule_in(self.lifetime, self.expire)
         self.occupied_space = ITEMS['SPAWN']['MIN_DISTANCE']
         self.color = COLORS['GREEN']
         
-        # Create the item's surface and rectangle
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (size, size), size)
+        # Get the item's surface and create its rectangle
+        self.image = get_circle_sprite(size, self.color)
         
         # Add a pulsing effect
         self.rect = self.image.get_rect()
@@ -45,8 +44,7 @@ class Item:
         scale_factor = 1 + math.sin(self.pulse_counter) * 0.1  # 10% size variation
         
         current_size = int(self.original_size * scale_factor)
-        self.image = pygame.Surface((current_size * 2, current_size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (current_size, current_size), current_size)
+        self.image = get_circle_sprite(current_size, self.color)
         
         # Keep the center position while updating the rect size
         center = self.rect.center
@@ -62,18 +60,15 @@ class Item:
             player.is_exhausted = False
             player.stamina_bar_visible = PLAYER['STAMINA']['BAR']['FADE_TIME']
         
-    def should_despawn(self, camera):
+    def expire(self):
+        """Timer callback, the item has existed for its whole lifetime"""
+        self.expired = True
+
+    def should_despawn(self, view):
         """Check if item should despawn based on lifetime and visibility"""
-        current_time = pygame.time.get_ticks()
-        time_alive = current_time - self.spawn_time
-        
         # If item has existed for more than lifetime
-        if time_alive > self.lifetime:
-            # Check if item is visible on screen
-            item_screen_pos = camera.apply(self.rect)
-            screen_rect = pygame.Rect(0, 0, WINDOW['WIDTH'], WINDOW['HEIGHT'])
-            
+        if self.expired:
             # Only despawn if item is off screen
-            return not screen_rect.colliderect(item_screen_pos)
+            return not view.is_on_screen(self.rect)
             
         return False
\ No newline at end of file
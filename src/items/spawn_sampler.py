@@ -0,0 +1,143 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.constants import ITEMS
+from src.utils.spatial_hash import SpatialHash
+
+class SpawnSampler:
+    """
+    Picks item spawn positions straight from the free space of the level.
+
+    Every chunk is divided into spawn cells of SPAWN_CELL occupancy cells a
+    side, and the spawn cells that keep `clearance` pixels away from walls
+    and the chunk border are listed once per chunk. A spawn picks a chunk
+    weighted by its free area with a bisect, a free spawn cell in it and a
+    pixel in that cell, then checks the spatial hash of live items for
+    anything closer than the minimum distance. When a few picks in a row land
+    too close to items, the free cells of every chunk are tested against the
+    items around them, so a spawn only fails when there is no space left.
+    """
+    ATTEMPTS = 8
+    SPAWN_CELL = 5
+    # Chunks whose free cells are listed per call, the rest wait for a later spawn
+    PREPARE_PER_SAMPLE = 4
+
+    def __init__(self, level, clearance: int = 20, min_distance: Optional[float] = None):
+        self.level = level
+        self.min_distance = min_distance or ITEMS['SPAWN']['MIN_DISTANCE']
+        self.cell_size = level.occupancy_cell_size * self.SPAWN_CELL
+        self.columns = level.occupancy_cells[0] // self.SPAWN_CELL
+        self.rows = level.occupancy_cells[1] // self.SPAWN_CELL
+        # Whole occupancy cells to keep free around a spawn cell
+        self.clearance_cells = -(-clearance // level.occupancy_cell_size)
+        # Free spawn cells per chunk as flat indices, row by row
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {}
+        self.level_version = level.version
+
+    def sample(self, chunks: List[Tuple[int, int]], items: SpatialHash) -> Optional[Tuple[int, int]]:
+        """
+        Random spawn position in one of the given chunks, None if there is no space
+        items: Live items, bucketed by their centres in cells of at least the
+               minimum distance.
+        """
+        if self.level.version != self.level_version:
+            self.level_version = self.level.version
+            for chunk_coords in [coords for coords in self.cells if coords not in self.level.occupancy]:
+                del self.cells[chunk_coords]
+
+        prepare = self.PREPARE_PER_SAMPLE
+        for chunk_coords in chunks:
+            if prepare and chunk_coords not in self.cells and chunk_coords in self.level.occupancy:
+                self.cells[chunk_coords] = self._free_cells(chunk_coords)
+                prepare -= 1
+        chunks = [coords for coords in chunks if coords in self.cells]
+        totals = list(accumulate(len(self.cells[coords]) for coords in chunks))
+        if not totals or not totals[-1]:
+            return None
+
+        for _ in range(self.ATTEMPTS):
+            index = bisect_right(totals, random.randrange(totals[-1]))
+            cells = self.cells[chunks[index]]
+            position = self._cell_position(chunks[index], int(cells[random.randrange(len(cells))]))
+            if not self._near_item(position, items):
+                return position
+
+        # Crowded, test every free cell against the items around its chunk
+        random.shuffle(chunks)
+        for chunk_coords in chunks:
+            position = self._clear_position(chunk_coords, items)
+            if position is not None:
+                return position
+        return None
+
+    def _free_cells(self, chunk_coords: Tuple[int, int]) -> np.ndarray:
+        """Spawn cells of a chunk at least the clearance away from walls and the chunk border"""
+        grid = self.level.occupancy[chunk_coords]
+        blocked = grid.cells(0, 0, grid.columns, grid.rows)
+        reach = self.clearance_cells
+
+        # Grow the walls by the clearance along both axes
+        grown = blocked.copy()
+        for shift in range(1, reach + 1):
+            grown[shift:] |= blocked[:-shift]
+            grown[:-shift] |= blocked[shift:]
+        blocked = grown.copy()
+        for shift in range(1, reach + 1):
+            grown[:, shift:] |= blocked[:, :-shift]
+            grown[:, :-shift] |= blocked[:, shift:]
+        rows, columns = grown.shape
+        grown[:reach] = grown[rows - reach:] = True
+        grown[:, :reach] = grown[:, columns - reach:] = True
+
+        # A spawn cell is free when every occupancy cell in it is
+        scale = self.SPAWN_CELL
+        grown = grown[:self.rows * scale, :self.columns * scale]
+        free = ~grown.reshape(self.rows, scale, self.columns, scale).any(axis=(1, 3))
+        return np.flatnonzero(free).astype(np.int32)
+
+    def _chunk_origin(self, chunk_coords: Tuple[int, int]) -> Tuple[int, int]:
+        grid = self.level.occupancy[chunk_coords]
+        return grid.left, grid.top
+
+    def _cell_position(self, chunk_coords: Tuple[int, int], cell: int) -> Tuple[int, int]:
+        """Random pixel inside a free spawn cell"""
+        left, top = self._chunk_origin(chunk_coords)
+        row, column = divmod(cell, self.columns)
+        return (left + column * self.cell_size + random.randrange(self.cell_size),
+                top + row * self.cell_size + random.randrange(self.cell_size))
+
+    def _near_item(self, position: Tuple[int, int], items: SpatialHash) -> bool:
+        limit = self.min_distance * self.min_distance
+        for item in items.nearby(*position):
+            dx = position[0] - item.rect.centerx
+            dy = position[1] - item.rect.centery
+            if dx * dx + dy * dy < limit:
+                return True
+        return False
+
+    def _clear_position(self, chunk_coords: Tuple[int, int], items: SpatialHash) -> Optional[Tuple[int, int]]:
+        """Random position in a free spawn cell whose whole area is clear of every item"""
+        cells = self.cells[chunk_coords]
+        chunk_left, chunk_top = self._chunk_origin(chunk_coords)
+        cell_size = self.cell_size
+        left = chunk_left + (cells % self.columns) * cell_size
+        top = chunk_top + (cells // self.columns) * cell_size
+
+        clear = np.ones(len(cells), dtype=bool)
+        reach = self.min_distance
+        for item in items.in_rect(chunk_left - reach, chunk_top - reach,
+                                  chunk_left + self.columns * cell_size + reach,
+                                  chunk_top + self.rows * cell_size + reach):
+            # Distance from the item to the closest point of each cell
+            dx = np.maximum(np.maximum(left - item.rect.centerx, item.rect.centerx - left - cell_size), 0)
+            dy = np.maximum(np.maximum(top - item.rect.centery, item.rect.centery - top - cell_size), 0)
+            clear &= dx * dx + dy * dy >= reach * reach
+
+        candidates = np.flatnonzero(clear)
+        if not len(candidates):
+            return None
+        return self._cell_position(chunk_coords, int(cells[random.choice(candidates)]))
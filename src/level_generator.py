@@ -1,35 +1,211 @@
+import heapq
+import math
+import os
 import random
-import threading
-from queue import Queue
-from typing import Dict, List, Set, Tuple
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pygame
 
 from src.constants import (
     WINDOW,
     LEVEL
 )
+from src.room_graph import RoomGraph, connect_rooms, stitch
+from src.utils.hash_rng import HashRng
+from src.utils.occupancy import OccupancyGrid
+from src.utils.wall_index import WallIndex
+from src.world_file import WorldFile
+
+def generate_chunk(chunk_coords: Tuple[int, int], world_seed: int) -> Tuple[array, array, array]:
+    """
+    Generate one chunk as flat int arrays of walls, rooms and doors
+    Walls and rooms are (x, y, width, height) each, doors are laid out as in
+    RoomGraph. Every leaf area of the split becomes a room and every gap cut
+    into a wall a door between the rooms on either side.
+    Runs in a worker process, so it only depends on its arguments and the
+    constants. Random numbers come from a stream keyed by the world seed and
+    the chunk coordinates, so a chunk comes out the same whichever worker
+    builds it, in whatever order, and can be dropped and rebuilt at will.
+    """
+    chunk_x, chunk_y = chunk_coords
+    chunk_width, chunk_height = WINDOW['WIDTH'], WINDOW['HEIGHT']
+    min_room_size = LEVEL['ROOM']['MIN_SIZE']
+    wall_thickness = LEVEL['WALL']['THICKNESS']
+    rng = HashRng(world_seed, chunk_x, chunk_y)
+    walls = array('i')
+    rooms = array('i')
+    gaps = []
+    
+    def split_area(x: int, y: int, w: int, h: int, depth: int = 0):
+        try:
+            if depth > LEVEL['GENERATION']['MAX_DEPTH']:
+                rooms.extend((x, y, w, h))
+                return
+            
+            can_split_vertical = w >= min_room_size * 2 + wall_thickness
+            can_split_horizontal = h >= min_room_size * 2 + wall_thickness
+            
+            if depth > 0 and rng.random() < LEVEL['GENERATION']['SPLIT_CHANCE']:
+                rooms.extend((x, y, w, h))
+                return
+            
+            if not (can_split_vertical or can_split_horizontal):
+                rooms.extend((x, y, w, h))
+                return
+            
+            # Favor splitting along the longer dimension
+            if can_split_vertical and can_split_horizontal:
+                split_vertical = w > h
+            elif can_split_vertical:
+                split_vertical = True
+            else:
+                split_vertical = False
+            
+            if split_vertical:
+                wall_x = x + w // 2
+                gap_height = LEVEL['WALL']['GAP_SIZE']
+                
+                # Add validation for random ranges
+                min_gap1 = y + gap_height
+                max_gap1 = y + (h // 2) - gap_height
+                min_gap2 = y + (h // 2)
+                max_gap2 = y + h - gap_height
+                
+                gap1_y = rng.randint(min_gap1, max_gap1)
+                gap2_y = rng.randint(min_gap2, max_gap2)
+                gaps.append((wall_x, gap1_y, wall_thickness, gap_height, True))
+                gaps.append((wall_x, gap2_y, wall_thickness, gap_height, True))
+                
+                # Create wall segments with validation
+                if gap1_y - y > 0:
+                    walls.extend((wall_x, y, wall_thickness, gap1_y - y))
+                if gap2_y - (gap1_y + gap_height) > 0:
+                    walls.extend((wall_x, gap1_y + gap_height, 
+                                  wall_thickness, gap2_y - (gap1_y + gap_height)))
+                if (y + h) - (gap2_y + gap_height) > 0:
+                    walls.extend((wall_x, gap2_y + gap_height,
+                                  wall_thickness, (y + h) - (gap2_y + gap_height)))
+                
+                # Recursive calls with validation
+                new_width = wall_x - x
+                if new_width > min_room_size:
+                    split_area(x, y, new_width, h, depth + 1)
+                else:
+                    rooms.extend((x, y, new_width, h))
+                
+                new_x = wall_x + wall_thickness
+                new_width = w - (wall_x - x) - wall_thickness
+                if new_width > min_room_size:
+                    split_area(new_x, y, new_width, h, depth + 1)
+                else:
+                    rooms.extend((new_x, y, new_width, h))
+                
+            else:
+                wall_y = y + h // 2
+                gap_width = LEVEL['WALL']['GAP_SIZE']
+                
+                # Add validation for random ranges
+                min_gap1 = x + gap_width
+                max_gap1 = x + (w // 2) - gap_width
+                min_gap2 = x + (w // 2)
+                max_gap2 = x + w - gap_width
+                
+                gap1_x = rng.randint(min_gap1, max_gap1)
+                gap2_x = rng.randint(min_gap2, max_gap2)
+                gaps.append((gap1_x, wall_y, gap_width, wall_thickness, False))
+                gaps.append((gap2_x, wall_y, gap_width, wall_thickness, False))
+                
+                # Create wall segments with validation
+                if gap1_x - x > 0:
+                    walls.extend((x, wall_y, gap1_x - x, wall_thickness))
+                if gap2_x - (gap1_x + gap_width) > 0:
+                    walls.extend((gap1_x + gap_width, wall_y,
+                                  gap2_x - (gap1_x + gap_width), wall_thickness))
+                if (x + w) - (gap2_x + gap_width) > 0:
+                    walls.extend((gap2_x + gap_width, wall_y,
+                                  (x + w) - (gap2_x + gap_width), wall_thickness))
+                
+                # Recursive calls with validation
+                new_height = wall_y - y
+                if new_height > min_room_size:
+                    split_area(x, y, w, new_height, depth + 1)
+                else:
+                    rooms.extend((x, y, w, new_height))
+                
+                new_y = wall_y + wall_thickness
+                new_height = h - (wall_y - y) - wall_thickness
+                if new_height > min_room_size:
+                    split_area(x, new_y, w, new_height, depth + 1)
+                else:
+                    rooms.extend((x, new_y, w, new_height))
+                
+        except Exception as e:
+            print(f"Error in split_area: {e}")
+            print(f"Parameters: x={x}, y={y}, w={w}, h={h}, depth={depth}")
+            # Nothing was cut yet, so the whole area stays one room
+            rooms.extend((x, y, w, h))
+    
+    try:
+        # Generate for this chunk
+        split_area(chunk_x * chunk_width, chunk_y * chunk_height, chunk_width, chunk_height)
+        return walls, rooms, connect_rooms(rooms, gaps)
+    except Exception as e:
+        print(f"Error in generate_chunk: {e}")
+        return array('i'), array('i'), array('i')
 
 class LevelGenerator:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None,
+                 world_path: Optional[str] = None):
+        """
+        seed: World seed, every chunk is generated from it and its coordinates.
+              A random seed is picked when None.
+        world_path: World file to load chunks from and save new chunks to.
+                    An existing file's own seed overrides `seed`.
+        """
         self.width = width
         self.height = height
         self.min_room_size = LEVEL['ROOM']['MIN_SIZE']
         self.wall_thickness = LEVEL['WALL']['THICKNESS']
         
-        # Dictionary to store walls by chunk coordinates
-        self.chunks: Dict[Tuple[int, int], List[pygame.Rect]] = {}
+        # Walls by chunk coordinates, least recently near the camera first
+        self.chunks: Dict[Tuple[int, int], List[pygame.Rect]] = OrderedDict()
+        # Static wall index per chunk, built once when the chunk is generated
+        self.wall_indices: Dict[Tuple[int, int], WallIndex] = {}
+        # Rooms and doors per chunk, linked to the graphs of resident neighbours
+        self.room_graphs: Dict[Tuple[int, int], RoomGraph] = {}
         self.chunk_size = (WINDOW['WIDTH'], WINDOW['HEIGHT'])
+        # Walls rasterized per chunk for constant time point and area tests
+        self.occupancy: Dict[Tuple[int, int], OccupancyGrid] = {}
+        self.occupancy_cell_size = LEVEL['OCCUPANCY_CELL_SIZE']
+        self.occupancy_cells = (self.chunk_size[0] // self.occupancy_cell_size,
+                                self.chunk_size[1] // self.occupancy_cell_size)
+        # Incremented every time chunks are added or evicted
+        self.version = 0
+        self.world_seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.world_file = None
+        if world_path:
+            self.world_file = WorldFile(world_path, self.world_seed, self.chunk_size)
+            self.world_seed = self.world_file.seed
         
         # Generate spawn room at screen center
-        spawn_chunk = (0, 0)
-        self.chunks[spawn_chunk] = self.generate_spawn_room()
+        # It is not built by generate_chunk, so it is never evicted
+        self.spawn_chunk = (0, 0)
+        self._store_chunk(self.spawn_chunk, self.generate_spawn_room(),
+                          self.generate_spawn_room_graph())
+        self.last_chunk: Optional[Tuple[int, int]] = None
         
-        # Threading setup
-        self.generation_queue = Queue()
-        self.processing_chunks: Set[Tuple[int, int]] = set()
-        self.generation_thread = threading.Thread(target=self._generation_worker, daemon=True)
-        self.generation_thread.start()
+        # Chunks are generated in worker processes so they never hold up the game loop
+        workers = LEVEL['GENERATION']['WORKERS'] or max(1, (os.cpu_count() or 2) - 1)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.processing_chunks: Dict[Tuple[int, int], Future] = {}
+        # Only a few chunks are handed to the pool at once so the rest stay
+        # in priority order and can still be reordered or dropped
+        self.max_in_flight = workers * 2
+        self.last_camera_pos: Optional[Tuple[float, float]] = None
     
     def get_chunk_coords(self, x: float, y: float) -> Tuple[int, int]:
         """Convert world coordinates to chunk coordinates"""
@@ -38,175 +214,314 @@ class LevelGenerator:
         return (chunk_x, chunk_y)
     
     def update(self, camera_x: float, camera_y: float):
-        """Check if new chunks need to be generated"""
+        """Collect finished chunks and queue missing ones nearest-first"""
+        self._collect_finished_chunks()
+        
+        # Camera movement since the last update, used to look ahead
+        if self.last_camera_pos is None:
+            velocity = (0.0, 0.0)
+        else:
+            velocity = (camera_x - self.last_camera_pos[0], camera_y - self.last_camera_pos[1])
+        self.last_camera_pos = (camera_x, camera_y)
+        
         current_chunk = self.get_chunk_coords(camera_x, camera_y)
+        radius = LEVEL['CHUNK_GENERATION_RADIUS']
+        in_radius = lambda coords: (abs(coords[0] - current_chunk[0]) <= radius and
+                                    abs(coords[1] - current_chunk[1]) <= radius)
+        
+        if current_chunk != self.last_chunk:
+            self.last_chunk = current_chunk
+            self._touch_chunks(current_chunk, radius)
+        self._evict_chunks(in_radius)
+        
+        # Drop requests the camera has moved away from. Chunks a worker
+        # already started cannot be cancelled and are kept when they finish.
+        for chunk_coords, future in list(self.processing_chunks.items()):
+            if not in_radius(chunk_coords) and future.cancel():
+                del self.processing_chunks[chunk_coords]
+        
+        free_slots = self.max_in_flight - len(self.processing_chunks)
+        if free_slots <= 0:
+            return
+        
+        screen = pygame.Rect(int(camera_x), int(camera_y), self.width, self.height)
+        lookahead = LEVEL['GENERATION']['LOOKAHEAD_TICKS']
+        target_x = screen.centerx + velocity[0] * lookahead
+        target_y = screen.centery + velocity[1] * lookahead
         
         # Check chunks in generation radius
-        for dx in range(-LEVEL['CHUNK_GENERATION_RADIUS'], LEVEL['CHUNK_GENERATION_RADIUS'] + 1):
-            for dy in range(-LEVEL['CHUNK_GENERATION_RADIUS'], LEVEL['CHUNK_GENERATION_RADIUS'] + 1):
+        queue = []
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
                 chunk_coords = (current_chunk[0] + dx, current_chunk[1] + dy)
                 
                 # Skip if chunk already exists or is being processed
                 if chunk_coords in self.chunks or chunk_coords in self.processing_chunks:
                     continue
-                    
-                # Add new chunk to generation queue
-                # print(f"Queueing new chunk {chunk_coords} for generation")
-                self.processing_chunks.add(chunk_coords)
-                self.generation_queue.put(chunk_coords)
-    
-    def _generation_worker(self):
-        """Background worker that generates new chunks"""
-        while True:
-            try:
-                chunk_coords = self.generation_queue.get()
-                if chunk_coords is None:
-                    break
                 
-                # Skip if chunk was already generated while in queue
-                if chunk_coords in self.chunks:
-                    self.processing_chunks.remove(chunk_coords)
-                    self.generation_queue.task_done()
+                # Saved chunks are a slice of the world file away
+                if self.world_file is not None and chunk_coords in self.world_file:
+                    walls, rooms, doors = self.world_file.read_chunk(chunk_coords)
+                    self._store_chunk(chunk_coords, self._walls_from_array(walls),
+                                      RoomGraph(array('i', rooms), array('i', doors)))
                     continue
-                    
-                # print(f"Worker starting generation of chunk {chunk_coords}")
-                
-                # Generate walls for this chunk
-                chunk_x, chunk_y = chunk_coords
-                chunk_walls = self._generate_chunk_walls(
-                    chunk_x * self.chunk_size[0],
-                    chunk_y * self.chunk_size[1]
-                )
                 
-                # Store the generated walls
-                self.chunks[chunk_coords] = chunk_walls
-                self.processing_chunks.remove(chunk_coords)
-                # print(f"Successfully generated chunk {chunk_coords}")
-                
-                self.generation_queue.task_done()
-            except Exception as e:
-                # print(f"Error generating chunk {chunk_coords}: {e}")
-                # Make sure we remove from processing even if there's an error
-                if chunk_coords in self.processing_chunks:
-                    self.processing_chunks.remove(chunk_coords)
-    
-    def _generate_chunk_walls(self, base_x: int, base_y: int) -> List[pygame.Rect]:
-        """Generate walls for a specific chunk"""
-        walls = []
+                heapq.heappush(queue, (self._chunk_priority(chunk_coords, screen, target_x, target_y),
+                                       chunk_coords))
         
-        def split_area(x: int, y: int, w: int, h: int, depth: int = 0):
+        # Hand the most urgent chunks to worker processes
+        while queue and free_slots > 0:
+            chunk_coords = heapq.heappop(queue)[1]
+            self.processing_chunks[chunk_coords] = self.executor.submit(
+                generate_chunk, chunk_coords, self.world_seed
+            )
+            free_slots -= 1
+    
+    def _chunk_priority(self, chunk_coords: Tuple[int, int], screen: pygame.Rect,
+                        target_x: float, target_y: float) -> Tuple[int, float]:
+        """
+        Sort key for generating a chunk, lower goes first
+        Chunks under the screen always come first, the rest by their distance
+        to where the camera is heading (target), so the chunk in the direction
+        of movement beats the one behind at the same distance.
+        """
+        chunk_rect = pygame.Rect(
+            chunk_coords[0] * self.chunk_size[0], chunk_coords[1] * self.chunk_size[1],
+            self.chunk_size[0], self.chunk_size[1]
+        )
+        # Distance from the target to the closest point of the chunk
+        dx = target_x - max(chunk_rect.left, min(target_x, chunk_rect.right))
+        dy = target_y - max(chunk_rect.top, min(target_y, chunk_rect.bottom))
+        return (0 if chunk_rect.colliderect(screen) else 1, dx * dx + dy * dy)
+    
+    def _collect_finished_chunks(self):
+        """Turn the arrays of finished workers into walls and room graphs on the main thread"""
+        for chunk_coords, future in list(self.processing_chunks.items()):
+            if not future.done():
+                continue
+            del self.processing_chunks[chunk_coords]
             try:
-                if depth > LEVEL['GENERATION']['MAX_DEPTH']:
-                    return
-                
-                can_split_vertical = w >= self.min_room_size * 2 + self.wall_thickness
-                can_split_horizontal = h >= self.min_room_size * 2 + self.wall_thickness
-                
-                if depth > 0 and random.random() < LEVEL['GENERATION']['SPLIT_CHANCE']:
-                    return
-                
-                if not (can_split_vertical or can_split_horizontal):
-                    return
-                
-                # Favor splitting along the longer dimension
-                if can_split_vertical and can_split_horizontal:
-                    split_vertical = w > h
-                elif can_split_vertical:
-                    split_vertical = True
-                else:
-                    split_vertical = False
-                
-                if split_vertical:
-                    wall_x = x + w // 2
-                    gap_height = LEVEL['WALL']['GAP_SIZE']
-                    
-                    # Add validation for random ranges
-                    min_gap1 = y + gap_height
-                    max_gap1 = y + (h // 2) - gap_height
-                    min_gap2 = y + (h // 2)
-                    max_gap2 = y + h - gap_height
-                    
-                    gap1_y = random.randint(min_gap1, max_gap1)
-                    gap2_y = random.randint(min_gap2, max_gap2)
-                    
-                    # Create wall segments with validation
-                    if gap1_y - y > 0:
-                        walls.append(pygame.Rect(wall_x, y, self.wall_thickness, gap1_y - y))
-                    if gap2_y - (gap1_y + gap_height) > 0:
-                        walls.append(pygame.Rect(wall_x, gap1_y + gap_height, 
-                                            self.wall_thickness, gap2_y - (gap1_y + gap_height)))
-                    if (y + h) - (gap2_y + gap_height) > 0:
-                        walls.append(pygame.Rect(wall_x, gap2_y + gap_height,
-                                            self.wall_thickness, (y + h) - (gap2_y + gap_height)))
-                    
-                    # Recursive calls with validation
-                    new_width = wall_x - x
-                    if new_width > self.min_room_size:
-                        split_area(x, y, new_width, h, depth + 1)
-                    
-                    new_x = wall_x + self.wall_thickness
-                    new_width = w - (wall_x - x) - self.wall_thickness
-                    if new_width > self.min_room_size:
-                        split_area(new_x, y, new_width, h, depth + 1)
-                    
-                else:
-                    wall_y = y + h // 2
-                    gap_width = LEVEL['WALL']['GAP_SIZE']
-                    
-                    # Add validation for random ranges
-                    min_gap1 = x + gap_width
-                    max_gap1 = x + (w // 2) - gap_width
-                    min_gap2 = x + (w // 2)
-                    max_gap2 = x + w - gap_width
-                    
-                    gap1_x = random.randint(min_gap1, max_gap1)
-                    gap2_x = random.randint(min_gap2, max_gap2)
-                    
-                    # Create wall segments with validation
-                    if gap1_x - x > 0:
-                        walls.append(pygame.Rect(x, wall_y, gap1_x - x, self.wall_thickness))
-                    if gap2_x - (gap1_x + gap_width) > 0:
-                        walls.append(pygame.Rect(gap1_x + gap_width, wall_y,
-                                            gap2_x - (gap1_x + gap_width), self.wall_thickness))
-                    if (x + w) - (gap2_x + gap_width) > 0:
-                        walls.append(pygame.Rect(gap2_x + gap_width, wall_y,
-                                            (x + w) - (gap2_x + gap_width), self.wall_thickness))
-                    
-                    # Recursive calls with validation
-                    new_height = wall_y - y
-                    if new_height > self.min_room_size:
-                        split_area(x, y, w, new_height, depth + 1)
-                    
-                    new_y = wall_y + self.wall_thickness
-                    new_height = h - (wall_y - y) - self.wall_thickness
-                    if new_height > self.min_room_size:
-                        split_area(x, new_y, w, new_height, depth + 1)
-                    
+                walls, rooms, doors = future.result()
             except Exception as e:
-                print(f"Error in split_area: {e}")
-                print(f"Parameters: x={x}, y={y}, w={w}, h={h}, depth={depth}")
-        
-        try:
-            # Generate for this chunk
-            split_area(base_x, base_y, self.chunk_size[0], self.chunk_size[1])
-            return walls
-        except Exception as e:
-            print(f"Error in _generate_chunk_walls: {e}")
-            return []
+                # Left out of chunks, so the next update queues it again
+                print(f"Error generating chunk {chunk_coords}: {e}")
+                continue
+            self._store_chunk(chunk_coords, self._walls_from_array(walls), RoomGraph(rooms, doors))
+            if self.world_file is not None:
+                self.world_file.write_chunk(chunk_coords, walls, rooms, doors)
     
-    def get_visible_walls(self, camera_x: float, camera_y: float) -> List[pygame.Rect]:
-        """Get all walls that should be visible to the player"""
-        visible_walls = []
-        current_chunk = self.get_chunk_coords(camera_x, camera_y)
-        
-        # Check chunks in view range
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
+    @staticmethod
+    def _walls_from_array(data) -> List[pygame.Rect]:
+        """Build walls from a flat sequence of (x, y, width, height) values"""
+        values = data.tolist()
+        return [pygame.Rect(values[i:i + 4]) for i in range(0, len(values), 4)]
+    
+    def shutdown(self):
+        """Stop the worker processes and finish writing the world file"""
+        # Queued chunks are cancelled, so this only waits for chunks already
+        # being built. Not waiting races the interpreter's exit handler, which
+        # can then write to the executor's closed wakeup pipe.
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.processing_chunks.clear()
+        if self.world_file is not None:
+            self.world_file.close()
+    
+    def _touch_chunks(self, current_chunk: Tuple[int, int], radius: int):
+        """Mark the chunks around the camera as the most recently used"""
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
                 chunk_coords = (current_chunk[0] + dx, current_chunk[1] + dy)
                 if chunk_coords in self.chunks:
-                    visible_walls.extend(self.chunks[chunk_coords])
+                    self.chunks.move_to_end(chunk_coords)
+    
+    def _evict_chunks(self, in_radius):
+        """
+        Drop least recently used chunks until the resident budget is met
+        Chunks in generation radius and the spawn room are kept. Evicted
+        chunks are regenerated from the world seed when the camera returns,
+        which gives back the exact same walls.
+        """
+        excess = len(self.chunks) - LEVEL['MAX_RESIDENT_CHUNKS']
+        if excess <= 0:
+            return
+        
+        evicted = []
+        for chunk_coords in self.chunks:
+            if len(evicted) >= excess:
+                break
+            if chunk_coords != self.spawn_chunk and not in_radius(chunk_coords):
+                evicted.append(chunk_coords)
+        
+        for chunk_coords in evicted:
+            del self.chunks[chunk_coords]
+            del self.wall_indices[chunk_coords]
+            del self.room_graphs[chunk_coords]
+            del self.occupancy[chunk_coords]
+            # Neighbours see the evicted chunk at the opposite offset
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                neighbour = self.room_graphs.get((chunk_coords[0] + dx, chunk_coords[1] + dy))
+                if neighbour is not None:
+                    neighbour.unlink(-dx, -dy)
+        if evicted:
+            self.version += 1
+    
+    def _store_chunk(self, chunk_coords: Tuple[int, int], walls: List[pygame.Rect],
+                     graph: RoomGraph):
+        """Index and rasterize a chunk's walls, link its rooms to the neighbours and publish the chunk"""
+        # Index first so a chunk is never visible without its index
+        self.wall_indices[chunk_coords] = WallIndex(walls)
+        origin = (chunk_coords[0] * self.chunk_size[0], chunk_coords[1] * self.chunk_size[1])
+        self.occupancy[chunk_coords] = OccupancyGrid(walls, origin, self.chunk_size,
+                                                     self.occupancy_cell_size)
+        self._link_room_graph(chunk_coords, graph)
+        self.chunks[chunk_coords] = walls
+        self.version += 1
+    
+    def _link_room_graph(self, chunk_coords: Tuple[int, int], graph: RoomGraph):
+        """Stitch a chunk's room graph to the graphs of the four chunks beside it"""
+        chunk_x, chunk_y = chunk_coords
+        chunk_width, chunk_height = self.chunk_size
+        self.room_graphs[chunk_coords] = graph
+        
+        left = self.room_graphs.get((chunk_x - 1, chunk_y))
+        if left is not None:
+            stitch(left, graph, 1, 0, chunk_x * chunk_width)
+        right = self.room_graphs.get((chunk_x + 1, chunk_y))
+        if right is not None:
+            stitch(graph, right, 1, 0, (chunk_x + 1) * chunk_width)
+        above = self.room_graphs.get((chunk_x, chunk_y - 1))
+        if above is not None:
+            stitch(above, graph, 0, 1, chunk_y * chunk_height)
+        below = self.room_graphs.get((chunk_x, chunk_y + 1))
+        if below is not None:
+            stitch(graph, below, 0, 1, (chunk_y + 1) * chunk_height)
+    
+    def room_at(self, point: Tuple[float, float]) -> Tuple[Tuple[int, int], int]:
+        """Chunk and room index at a world point, room is -1 inside walls or unloaded chunks"""
+        chunk_coords = self.get_chunk_coords(point[0], point[1])
+        graph = self.room_graphs.get(chunk_coords)
+        if graph is None:
+            return chunk_coords, -1
+        return chunk_coords, graph.room_at(point[0], point[1])
+    
+    def walls_overlapping(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Get all walls overlapping rect, across every chunk the rect touches"""
+        # Walls never cross chunk borders, so only the chunks under rect matter
+        first_chunk = self.get_chunk_coords(rect.left, rect.top)
+        last_chunk = self.get_chunk_coords(rect.right - 1, rect.bottom - 1)
         
-        return visible_walls
+        walls = []
+        for chunk_x in range(first_chunk[0], last_chunk[0] + 1):
+            for chunk_y in range(first_chunk[1], last_chunk[1] + 1):
+                wall_index = self.wall_indices.get((chunk_x, chunk_y))
+                if wall_index:
+                    walls.extend(wall_index.overlapping(rect))
+        return walls
+    
+    def is_generated(self, rect: pygame.Rect) -> bool:
+        """Check if every chunk under rect has been generated"""
+        first_chunk = self.get_chunk_coords(rect.left, rect.top)
+        last_chunk = self.get_chunk_coords(rect.right - 1, rect.bottom - 1)
+        
+        for chunk_x in range(first_chunk[0], last_chunk[0] + 1):
+            for chunk_y in range(first_chunk[1], last_chunk[1] + 1):
+                if (chunk_x, chunk_y) not in self.chunks:
+                    return False
+        return True
+    
+    def _cell_blocked(self, cell_x: int, cell_y: int) -> bool:
+        """Check a world occupancy cell, cells of chunks not generated yet are free"""
+        columns, rows = self.occupancy_cells
+        grid = self.occupancy.get((cell_x // columns, cell_y // rows))
+        return grid is not None and grid.cell_blocked(cell_x % columns, cell_y % rows)
+    
+    def is_wall_at(self, point: Tuple[float, float]) -> bool:
+        """Check if a point lies in an occupied cell"""
+        cell_size = self.occupancy_cell_size
+        return self._cell_blocked(int(point[0] // cell_size), int(point[1] // cell_size))
+    
+    def circle_hits_wall(self, point: Tuple[float, float], radius: float) -> bool:
+        """Check if the disc at point with the given radius touches an occupied cell"""
+        cell_size = self.occupancy_cell_size
+        x, y = point
+        for cell_y in range(int((y - radius) // cell_size), int((y + radius) // cell_size) + 1):
+            # Distance from the centre to the closest point of this row
+            top = cell_y * cell_size
+            dy = max(top - y, 0, y - top - cell_size)
+            for cell_x in range(int((x - radius) // cell_size), int((x + radius) // cell_size) + 1):
+                if not self._cell_blocked(cell_x, cell_y):
+                    continue
+                left = cell_x * cell_size
+                dx = max(left - x, 0, x - left - cell_size)
+                if dx * dx + dy * dy < radius * radius:
+                    return True
+        return False
+    
+    def segment_hits_wall(self, start: Tuple[float, float], end: Tuple[float, float]) -> bool:
+        """Check if the segment from start to end crosses an occupied cell"""
+        cell_size = self.occupancy_cell_size
+        x, y = start
+        dx, dy = end[0] - x, end[1] - y
+        cell_x, cell_y = int(x // cell_size), int(y // cell_size)
+        steps = abs(int(end[0] // cell_size) - cell_x) + abs(int(end[1] // cell_size) - cell_y)
+        
+        # Walk the cells in the order the segment enters them, by the fraction
+        # of the segment at which it crosses the next column and row border
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        next_x = ((cell_x + (dx > 0)) * cell_size - x) / dx if dx else math.inf
+        next_y = ((cell_y + (dy > 0)) * cell_size - y) / dy if dy else math.inf
+        delta_x = cell_size / abs(dx) if dx else math.inf
+        delta_y = cell_size / abs(dy) if dy else math.inf
+        
+        for _ in range(steps + 1):
+            if self._cell_blocked(cell_x, cell_y):
+                return True
+            if next_x < next_y:
+                cell_x += step_x
+                next_x += delta_x
+            else:
+                cell_y += step_y
+                next_y += delta_y
+        return False
+    
+    def occupancy_area(self, first_cell: Tuple[int, int], columns: int, rows: int) -> np.ndarray:
+        """
+        Occupancy of a block of world cells as a (rows, columns) bool array
+        Cells of chunks not generated yet are free.
+        """
+        area = np.zeros((rows, columns), dtype=bool)
+        chunk_columns, chunk_rows = self.occupancy_cells
+        first_x, first_y = first_cell
+        last_x, last_y = first_x + columns, first_y + rows
+        for chunk_x in range(first_x // chunk_columns, (last_x - 1) // chunk_columns + 1):
+            for chunk_y in range(first_y // chunk_rows, (last_y - 1) // chunk_rows + 1):
+                grid = self.occupancy.get((chunk_x, chunk_y))
+                if grid is None:
+                    continue
+                # Overlap of the block and this chunk in world cells
+                left = max(first_x, chunk_x * chunk_columns)
+                right = min(last_x, (chunk_x + 1) * chunk_columns)
+                top = max(first_y, chunk_y * chunk_rows)
+                bottom = min(last_y, (chunk_y + 1) * chunk_rows)
+                area[top - first_y:bottom - first_y, left - first_x:right - first_x] = grid.cells(
+                    left - chunk_x * chunk_columns, top - chunk_y * chunk_rows,
+                    right - chunk_x * chunk_columns, bottom - chunk_y * chunk_rows
+                )
+        return area
+    
+    def walls_near(self, point: Tuple[float, float], radius: float) -> List[pygame.Rect]:
+        """Get all walls intersecting the circle at point with the given radius"""
+        first_chunk = self.get_chunk_coords(point[0] - radius, point[1] - radius)
+        last_chunk = self.get_chunk_coords(point[0] + radius, point[1] + radius)
+        
+        walls = []
+        for chunk_x in range(first_chunk[0], last_chunk[0] + 1):
+            for chunk_y in range(first_chunk[1], last_chunk[1] + 1):
+                wall_index = self.wall_indices.get((chunk_x, chunk_y))
+                if wall_index:
+                    walls.extend(wall_index.near(point, radius))
+        return walls
     
     def generate_spawn_room(self) -> List[pygame.Rect]:
         walls = []
@@ -248,4 +563,45 @@ class LevelGenerator:
             pygame.Rect(right - wall_thickness, bottom - (room_size - gap_size) // 2, wall_thickness, (room_size - gap_size) // 2)  # Bottom segment
         ])
         
-        return walls
\ No newline at end of file
+        return walls
+    
+    def generate_spawn_room_graph(self) -> RoomGraph:
+        """
+        Rooms and doors of the spawn chunk
+        The room inside the walls opens through its four gaps into the strips
+        around it, and the strips touch each other at the corners.
+        """
+        room_size = LEVEL['ROOM']['SPAWN_SIZE']
+        gap_size = LEVEL['WALL']['GAP_SIZE']
+        wall_thickness = self.wall_thickness
+        width, height = self.chunk_size
+        
+        center_x = WINDOW['WIDTH'] // 2
+        center_y = WINDOW['HEIGHT'] // 2
+        left = center_x - room_size // 2
+        right = center_x + room_size // 2
+        top = center_y - room_size // 2
+        bottom = center_y + room_size // 2
+        segment = (room_size - gap_size) // 2
+        
+        rooms = array('i', (
+            left + wall_thickness, top + wall_thickness,
+            right - left - 2 * wall_thickness, bottom - top - 2 * wall_thickness,  # 0: inside
+            0, 0, width, top,                                   # 1: above
+            0, bottom, width, height - bottom,                  # 2: below
+            0, top, left, bottom - top,                         # 3: left
+            right, top, width - right, bottom - top,            # 4: right
+        ))
+        gap_x, gap_w = left + segment, right - segment - (left + segment)
+        gap_y, gap_h = top + segment, bottom - segment - (top + segment)
+        doors = array('i', (
+            0, 1, gap_x, top, gap_w, wall_thickness,                    # North gap
+            0, 2, gap_x, bottom - wall_thickness, gap_w, wall_thickness,  # South gap
+            0, 3, left, gap_y, wall_thickness, gap_h,                   # West gap
+            0, 4, right - wall_thickness, gap_y, wall_thickness, gap_h,   # East gap
+            1, 3, 0, top, left, 0,
+            1, 4, right, top, width - right, 0,
+            2, 3, 0, bottom, left, 0,
+            2, 4, right, bottom, width - right, 0,
+        ))
+        return RoomGraph(rooms, doors)
@@ -1,12 +1,38 @@
+import argparse
 import sys
+import time
 import traceback
 
 from src.game import Game
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="grep")
+    parser.add_argument('--headless', action='store_true',
+                        help="simulate without a window as fast as possible")
+    parser.add_argument('--ticks', type=int, help="headless: number of ticks to simulate")
+    parser.add_argument('--duration', type=float, help="headless: seconds to simulate for")
+    parser.add_argument('--world', help="world file to load and save generated chunks")
+    return parser.parse_args()
+
+def run_headless(args):
+    ticks = args.ticks
+    if ticks is None and args.duration is None:
+        ticks = 10000
+    game = Game(headless=True, world_path=args.world)
+    start = time.perf_counter()
+    simulated = game.run_headless(ticks=ticks, duration=args.duration)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {simulated} ticks in {elapsed:.2f}s "
+          f"({simulated / max(elapsed, 1e-9):.0f} ticks/s), state: {game.state}")
+
 def main():
+    args = parse_args()
     try:
-        game = Game()
-        game.run()
+        if args.headless:
+            run_headless(args)
+        else:
+            game = Game(world_path=args.world)
+            game.run()
     except Exception as e:
         with open('error_log.txt', 'w') as f:
             f.write(f"Error: {str(e)}\n")
@@ -14,4 +40,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,6 +2,7 @@ from typing import List, Tuple, Callable
 import pygame
 from src.constants import WINDOW, COLORS
 from src.controls import Controls
+from src.clock import GameClock
 
 class Menu:
     def __init__(self, screen: pygame.Surface, settings=None):
@@ -13,6 +14,8 @@ class Menu:
         self.title = ""
         self.settings = settings
         self.controls = Controls()
+        # Menus keep their own clock so input cooldowns work while the game is not ticking
+        self.clock = GameClock()
         self.input_cooldown = 0
         self.cooldown_duration = 200
         
@@ -33,7 +36,7 @@ class Menu:
         self.options.append((text, callback))
         
     def handle_input(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time < self.input_cooldown:
             return
 
@@ -0,0 +1,11 @@
+"""
+Pathfinding for enemies chasing the player.
+"""
+
+from .flow_field import FlowField
+from .room_planner import RoomPlanner
+
+__all__ = [
+    'FlowField',
+    'RoomPlanner'
+]
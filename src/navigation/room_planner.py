@@ -0,0 +1,209 @@
+import heapq
+import itertools
+import math
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from src.constants import NAVIGATION
+
+Chunk = Tuple[int, int]
+# A room is addressed by its chunk and its index in that chunk's RoomGraph
+Node = Tuple[Chunk, int]
+Point = Tuple[float, float]
+
+
+def room_centre(level, node: Node) -> Point:
+    rect = level.room_graphs[node[0]].room_rect(node[1])
+    return rect.centerx, rect.centery
+
+
+class RoomSearch:
+    """
+    A* over rooms from one room to another, restricted to a set of chunks.
+
+    The search can be stopped after any number of expansions and resumed on
+    a later tick. Rooms are scored by the distance between their centres
+    through the door between them.
+    """
+    def __init__(self, level, start: Node, goal: Node, corridor: FrozenSet[Chunk]):
+        self.level = level
+        self.goal = goal
+        self.corridor = corridor
+        self.goal_centre = room_centre(level, goal)
+        self.cost: Dict[Node, float] = {start: 0.0}
+        # Room -> (previous room, door centre between them)
+        self.came_from: Dict[Node, Tuple[Node, Point]] = {}
+        self.closed: Set[Node] = set()
+        self.counter = itertools.count()  # Breaks ties without comparing nodes
+        self.open = [(self._estimate(start), next(self.counter), start)]
+        self.done = False
+        self.found = False
+
+    def _estimate(self, node: Node) -> float:
+        x, y = room_centre(self.level, node)
+        return math.hypot(self.goal_centre[0] - x, self.goal_centre[1] - y)
+
+    def run(self, budget: int) -> int:
+        """Expand up to `budget` rooms, returns how many were expanded"""
+        room_graphs = self.level.room_graphs
+        expanded = 0
+        while self.open and expanded < budget:
+            node = heapq.heappop(self.open)[2]
+            if node in self.closed:
+                continue
+            if node == self.goal:
+                self.done = self.found = True
+                return expanded
+            self.closed.add(node)
+            expanded += 1
+
+            chunk, room = node
+            centre_x, centre_y = room_centre(self.level, node)
+            for (dx, dy), other, door in room_graphs[chunk].neighbours(room):
+                other_chunk = (chunk[0] + dx, chunk[1] + dy)
+                if other_chunk not in self.corridor:
+                    continue
+                neighbour = (other_chunk, other)
+                if neighbour in self.closed:
+                    continue
+                door_x, door_y = door.centerx, door.centery
+                other_x, other_y = room_centre(self.level, neighbour)
+                cost = (self.cost[node] + math.hypot(door_x - centre_x, door_y - centre_y) +
+                        math.hypot(other_x - door_x, other_y - door_y))
+                if cost < self.cost.get(neighbour, math.inf):
+                    self.cost[neighbour] = cost
+                    self.came_from[neighbour] = (node, (door_x, door_y))
+                    heapq.heappush(self.open, (cost + self._estimate(neighbour),
+                                               next(self.counter), neighbour))
+
+        if not self.open:
+            self.done = True
+        return expanded
+
+    def waypoints(self) -> Dict[Node, Point]:
+        """Door to head for from every room on the found path"""
+        route = {}
+        node = self.goal
+        while node in self.came_from:
+            previous, door = self.came_from[node]
+            route[previous] = door
+            node = previous
+        return route
+
+
+class RoomPlanner:
+    """
+    Hierarchical A* toward the player over the chunk room graphs.
+
+    A path is first planned across chunks, stepping between chunks whose
+    rooms are linked through the shared border. A room-level A* then runs
+    only inside the chunks on that route. Room searches share an expansion
+    budget that is refilled every tick. A search that runs out of budget
+    resumes on the next tick, so long-range pursuit never costs more than a
+    fixed amount of work per tick. Found routes map every room on the path
+    to the door to head for, so enemies on the same route share one search.
+    Everything cached is dropped when chunks are loaded or evicted.
+    """
+    def __init__(self, level, expansions_per_tick: Optional[int] = None):
+        self.level = level
+        self.expansions_per_tick = expansions_per_tick or NAVIGATION['PATH_EXPANSIONS_PER_TICK']
+        self.budget = self.expansions_per_tick
+        self.level_version = level.version
+        # (start chunk, goal chunk) -> chunks on the route, None if unreachable
+        self.chunk_paths: Dict[Tuple[Chunk, Chunk], Optional[FrozenSet[Chunk]]] = {}
+        self.chunk_links: Dict[Chunk, FrozenSet[Chunk]] = {}
+        # Goal room -> door to head for from each room with a known route, None without one
+        self.routes: Dict[Node, Dict[Node, Optional[Point]]] = {}
+        self.searches: Dict[Tuple[Node, Node], RoomSearch] = {}
+        self.wanted: Set[Tuple[Node, Node]] = set()
+
+    def update(self):
+        """Refill the budget, drop searches and routes nobody asked for last tick"""
+        self.budget = self.expansions_per_tick
+        if self.level.version != self.level_version:
+            self.level_version = self.level.version
+            self.chunk_paths.clear()
+            self.chunk_links.clear()
+            self.routes.clear()
+            self.searches.clear()
+        else:
+            goals = {goal for _, goal in self.wanted}
+            for key in [key for key in self.searches if key not in self.wanted]:
+                del self.searches[key]
+            for goal in [goal for goal in self.routes if goal not in goals]:
+                del self.routes[goal]
+        self.wanted.clear()
+
+    def waypoint(self, start_point: Point, goal_point: Point) -> Optional[Point]:
+        """
+        Point to head for on the way from start_point to goal_point
+        None when both are in the same room, either lies inside a wall or an
+        unloaded chunk, no route exists, or the route is still being searched.
+        """
+        start = self.level.room_at(start_point)
+        goal = self.level.room_at(goal_point)
+        if start[1] < 0 or goal[1] < 0 or start == goal:
+            return None
+
+        key = (start, goal)
+        self.wanted.add(key)
+        route = self.routes.get(goal)
+        if route is not None and start in route:
+            return route[start]
+
+        search = self.searches.get(key)
+        if search is None:
+            corridor = self._chunk_path(start[0], goal[0])
+            if corridor is None:
+                self.routes.setdefault(goal, {})[start] = None
+                return None
+            search = self.searches[key] = RoomSearch(self.level, start, goal, corridor)
+
+        if self.budget > 0:
+            self.budget -= search.run(self.budget)
+        if not search.done:
+            return None
+
+        del self.searches[key]
+        route = self.routes.setdefault(goal, {})
+        if search.found:
+            route.update(search.waypoints())
+        return route.setdefault(start, None)
+
+    def _chunk_path(self, start: Chunk, goal: Chunk) -> Optional[FrozenSet[Chunk]]:
+        """Chunks on the shortest route between two chunks through linked borders"""
+        key = (start, goal)
+        if key not in self.chunk_paths:
+            self.chunk_paths[key] = self._search_chunks(start, goal)
+        return self.chunk_paths[key]
+
+    def _linked_chunks(self, chunk: Chunk) -> FrozenSet[Chunk]:
+        linked = self.chunk_links.get(chunk)
+        if linked is None:
+            links = self.level.room_graphs[chunk].links
+            offsets = {(links[i + 1], links[i + 2]) for i in range(0, len(links), 8)}
+            linked = frozenset((chunk[0] + dx, chunk[1] + dy) for dx, dy in offsets)
+            self.chunk_links[chunk] = linked
+        return linked
+
+    def _search_chunks(self, start: Chunk, goal: Chunk) -> Optional[FrozenSet[Chunk]]:
+        """A* over resident chunks, one step per border crossed"""
+        estimate = lambda chunk: abs(goal[0] - chunk[0]) + abs(goal[1] - chunk[1])
+        cost = {start: 0}
+        came_from = {}
+        open_chunks = [(estimate(start), start)]
+        while open_chunks:
+            chunk = heapq.heappop(open_chunks)[1]
+            if chunk == goal:
+                path = {goal}
+                while chunk in came_from:
+                    chunk = came_from[chunk]
+                    path.add(chunk)
+                return frozenset(path)
+            for other in self._linked_chunks(chunk):
+                if other not in self.level.room_graphs:
+                    continue
+                if cost[chunk] + 1 < cost.get(other, math.inf):
+                    cost[other] = cost[chunk] + 1
+                    came_from[other] = chunk
+                    heapq.heappush(open_chunks, (cost[other] + estimate(other), other))
+        return None
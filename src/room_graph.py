@@ -0,0 +1,130 @@
+from array import array
+from typing import Iterator, Tuple
+
+import pygame
+
+class RoomGraph:
+    """
+    Topology of one chunk as flat int arrays.
+
+    rooms: x, y, width, height per room (the BSP leaves)
+    doors: room a, room b, x, y, width, height per door inside the chunk
+    links: room, chunk dx, chunk dy, other room, x, y, width, height per
+           connection into a neighbouring chunk, filled in by stitching
+
+    Door rects are the openings rooms connect through. A gap cut into a wall
+    is as thick as the wall; rooms that touch directly, like rooms on both
+    sides of a chunk border, get a zero-thickness door along the shared edge.
+    """
+    ROOM_SIZE = 4
+    DOOR_SIZE = 6
+    LINK_SIZE = 8
+
+    def __init__(self, rooms: array, doors: array):
+        self.rooms = rooms
+        self.doors = doors
+        self.links = array('i')
+
+    def __len__(self) -> int:
+        return len(self.rooms) // self.ROOM_SIZE
+
+    def room_rect(self, room: int) -> pygame.Rect:
+        start = room * self.ROOM_SIZE
+        return pygame.Rect(self.rooms[start:start + self.ROOM_SIZE].tolist())
+
+    def room_at(self, x: float, y: float) -> int:
+        """Index of the room containing the point, -1 inside walls or outside the chunk"""
+        rooms = self.rooms
+        for start in range(0, len(rooms), self.ROOM_SIZE):
+            if (rooms[start] <= x < rooms[start] + rooms[start + 2] and
+                    rooms[start + 1] <= y < rooms[start + 1] + rooms[start + 3]):
+                return start // self.ROOM_SIZE
+        return -1
+
+    def neighbours(self, room: int) -> Iterator[Tuple[Tuple[int, int], int, pygame.Rect]]:
+        """
+        Yield (chunk offset, room, door rect) for every room reachable from `room`
+        The chunk offset is (0, 0) for rooms in this chunk.
+        """
+        doors = self.doors
+        for start in range(0, len(doors), self.DOOR_SIZE):
+            if doors[start] == room:
+                yield (0, 0), doors[start + 1], pygame.Rect(doors[start + 2:start + 6].tolist())
+            elif doors[start + 1] == room:
+                yield (0, 0), doors[start], pygame.Rect(doors[start + 2:start + 6].tolist())
+
+        links = self.links
+        for start in range(0, len(links), self.LINK_SIZE):
+            if links[start] == room:
+                yield ((links[start + 1], links[start + 2]), links[start + 3],
+                       pygame.Rect(links[start + 4:start + 8].tolist()))
+
+    def unlink(self, dx: int, dy: int):
+        """Drop every link into the neighbouring chunk at offset (dx, dy)"""
+        kept = array('i')
+        links = self.links
+        for start in range(0, len(links), self.LINK_SIZE):
+            if links[start + 1] != dx or links[start + 2] != dy:
+                kept.extend(links[start:start + self.LINK_SIZE])
+        self.links = kept
+
+
+def connect_rooms(rooms: array, gaps) -> array:
+    """
+    Build the door array for the gaps cut into walls
+    gaps: (x, y, width, height, vertical) per gap, vertical for gaps in
+          vertical walls, which connect rooms left and right of the wall.
+    """
+    doors = array('i')
+    count = len(rooms) // RoomGraph.ROOM_SIZE
+    rects = [rooms[i * 4:i * 4 + 4] for i in range(count)]
+
+    for gap_x, gap_y, gap_w, gap_h, vertical in gaps:
+        for a in range(count):
+            ax, ay, aw, ah = rects[a]
+            # Room a sits left of (or above) the gap, room b right of (or below) it
+            if vertical and ax + aw != gap_x or not vertical and ay + ah != gap_y:
+                continue
+            for b in range(count):
+                bx, by, bw, bh = rects[b]
+                if vertical:
+                    if bx != gap_x + gap_w:
+                        continue
+                    low = max(gap_y, ay, by)
+                    high = min(gap_y + gap_h, ay + ah, by + bh)
+                    if high > low:
+                        doors.extend((a, b, gap_x, low, gap_w, high - low))
+                else:
+                    if by != gap_y + gap_h:
+                        continue
+                    low = max(gap_x, ax, bx)
+                    high = min(gap_x + gap_w, ax + aw, bx + bw)
+                    if high > low:
+                        doors.extend((a, b, low, gap_y, high - low, gap_h))
+    return doors
+
+
+def stitch(first: RoomGraph, second: RoomGraph, dx: int, dy: int, edge: int):
+    """
+    Link the rooms of two neighbouring chunks across their shared border
+    second lies at offset (dx, dy) from first, either (1, 0) or (0, 1), and
+    edge is the world x (or y) of the border between them.
+    """
+    size = RoomGraph.ROOM_SIZE
+    for a in range(len(first)):
+        ax, ay, aw, ah = first.rooms[a * size:a * size + size]
+        if (ax + aw if dx else ay + ah) != edge:
+            continue
+        for b in range(len(second)):
+            bx, by, bw, bh = second.rooms[b * size:b * size + size]
+            if (bx if dx else by) != edge:
+                continue
+            if dx:
+                low, high = max(ay, by), min(ay + ah, by + bh)
+                door = (edge, low, 0, high - low)
+            else:
+                low, high = max(ax, bx), min(ax + aw, bx + bw)
+                door = (low, edge, high - low, 0)
+            if high > low:
+                first.links.extend((a, dx, dy, b) + door)
+                second.links.extend((b, -dx, -dy, a) + door)
@@ -0,0 +1,60 @@
+import heapq
+import itertools
+from typing import Any, Callable, List, Tuple
+
+from src.clock import GameClock
+
+class Timer:
+    """Handle to a scheduled callback, used to cancel it before it fires"""
+    def __init__(self, time: float, callback: Callable, args: Tuple[Any, ...]):
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Min-heap of timers on game time.
+
+    Entities register "do this at T" callbacks instead of comparing
+    timestamps every tick. run_due() pops only the timers whose time has
+    come, so the work per tick grows with the number of due timers, not with
+    the number of entities waiting on one. Cancelled timers stay in the heap
+    and are skipped when they reach the top.
+    """
+    def __init__(self, clock: GameClock):
+        self.clock = clock
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._counter = itertools.count()  # Keeps timers due at the same time in FIFO order
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, time: float, callback: Callable, *args) -> Timer:
+        """Call callback(*args) once game time reaches `time` (milliseconds)"""
+        timer = Timer(time, callback, args)
+        heapq.heappush(self._heap, (time, next(self._counter), timer))
+        return timer
+
+    def schedule_in(self, delay: float, callback: Callable, *args) -> Timer:
+        """Call callback(*args) after `delay` milliseconds of game time"""
+        return self.schedule(self.clock.get_ticks() + delay, callback, *args)
+
+    def run_due(self) -> int:
+        """Fire every timer that is due, returns how many callbacks ran"""
+        now = self.clock.get_ticks()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+                fired += 1
+        return fired
+
+    def clear(self):
+        self._heap.clear()
@@ -1,4 +1,5 @@
 from src.constants import COLORS, MENU  # Import COLORS from constants
+from src.utils.sprite_cache import clear_sprite_cache
 
 class Settings:
     def __init__(self):
@@ -12,6 +13,9 @@ class Settings:
         else:
             self.apply_light_mode()
         
+        # Cached sprites were drawn with the old palette
+        clear_sprite_cache()
+        
         # Update any active menus
         from src.game import Game
         if hasattr(Game, 'instance') and Game.instance and Game.instance.menu:
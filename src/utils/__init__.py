@@ -1,11 +1,13 @@
 """
-Utility functions for collision detection and physics.
+Utility functions for collision detection, physics and rendering.
 """
 
 from .collision import (
     check_circle_collision,
     check_wall_collisions,
     resolve_wall_collision,
+    sweep_rect,
+    move_and_slide,
     line_intersects_rect,
     push_out_of_walls,
     line_segments_intersect,
@@ -16,11 +18,18 @@ from .collision import (
     handle_item_player_collision,
     handle_projectile_wall_collision
 )
+from .spatial_hash import SpatialHash
+from .wall_index import WallIndex
+from .occupancy import OccupancyGrid
+from .sprite_cache import SpriteCache, get_circle_sprite, clear_sprite_cache
+from .hash_rng import HashRng
 
 __all__ = [
     'check_circle_collision',
     'check_wall_collisions',
     'resolve_wall_collision',
+    'sweep_rect',
+    'move_and_slide',
     'line_intersects_rect',
     'push_out_of_walls',
     'line_segments_intersect',
@@ -29,5 +38,12 @@ __all__ = [
     'handle_player_enemy_collision',
     'handle_projectile_projectile_collision',
     'handle_item_player_collision',
-    'handle_projectile_wall_collision'
+    'handle_projectile_wall_collision',
+    'SpatialHash',
+    'WallIndex',
+    'OccupancyGrid',
+    'SpriteCache',
+    'get_circle_sprite',
+    'clear_sprite_cache',
+    'HashRng'
 ] 
\ No newline at end of file
@@ -2,9 +2,10 @@ from typing import List, Dict, Tuple, Optional, Any
 import math
 import random
 
+import numpy as np
 import pygame
 
-from src.constants import ENEMY
+from src.constants import ENEMY, COLLISION
 
 def check_circle_collision(circle1: Dict, circle2: Dict) -> bool:
     """Check collision between two circles using their centers and radii"""
@@ -35,61 +36,85 @@ def check_wall_collisions(rect: pygame.Rect, walls: List[pygame.Rect]) -> Tuple[
                 
     return False, None
 
-def resolve_wall_collision(old_pos: pygame.Rect, new_pos: pygame.Rect, walls: List[pygame.Rect]) -> pygame.Rect:
-    """Resolve collision with walls using continuous collision detection"""
-    # First check if there's any collision at all
-    if not any(new_pos.colliderect(wall) for wall in walls):
-        return new_pos
-
-    # Calculate movement vector
-    movement_x = new_pos.x - old_pos.x
-    movement_y = new_pos.y - old_pos.y
-
-    # If no movement, return current position
-    if movement_x == 0 and movement_y == 0:
-        return old_pos
-
-    # Try to find the furthest safe position using binary search
-    steps = 8  # Number of binary search steps (increase for more precision)
-    min_t = 0.0
-    max_t = 1.0
-    best_pos = old_pos.copy()
-
-    for _ in range(steps):
-        # Try a position halfway between min_t and max_t
-        t = (min_t + max_t) / 2
-        test_pos = old_pos.copy()
-        test_pos.x = old_pos.x + movement_x * t
-        test_pos.y = old_pos.y + movement_y * t
-
-        # Check if this position is safe
-        if any(test_pos.colliderect(wall) for wall in walls):
-            max_t = t  # Position caused collision, try earlier
+def sweep_rect(rect: pygame.Rect, dx: float, dy: float,
+               walls: List[pygame.Rect]) -> Tuple[float, int, int]:
+    """
+    Find the exact time of impact of a rect moving by (dx, dy) against walls
+    Returns: (time, normal_x, normal_y)
+    time is the fraction of the movement that can be made before touching a wall
+    (1.0 if the whole movement is free) and the normal is the side that was hit.
+    Walls the rect already overlaps are ignored so it can move out of them.
+    """
+    hit_time = 1.0
+    normal_x, normal_y = 0, 0
+    
+    for wall in walls:
+        if rect.colliderect(wall):
+            continue
+        
+        # Time interval during which the rect overlaps the wall on each axis
+        if dx > 0:
+            entry_x = (wall.left - rect.right) / dx
+            exit_x = (wall.right - rect.left) / dx
+        elif dx < 0:
+            entry_x = (wall.right - rect.left) / dx
+            exit_x = (wall.left - rect.right) / dx
+        elif rect.right <= wall.left or rect.left >= wall.right:
+            continue  # Never overlaps on this axis
         else:
-            min_t = t  # Position was safe, try later
-            best_pos = test_pos.copy()
-
-    # Now we have the furthest safe position
-    result_pos = best_pos.copy()
-
-    # Try to slide along walls if we hit them
-    if min_t < 1.0:  # If we didn't reach the target position
-        remaining_x = movement_x * (1 - min_t)
-        remaining_y = movement_y * (1 - min_t)
-
-        # Try horizontal movement
-        test_pos = result_pos.copy()
-        test_pos.x += remaining_x
-        if not any(test_pos.colliderect(wall) for wall in walls):
-            result_pos.x = test_pos.x
+            entry_x, exit_x = -math.inf, math.inf
+        
+        if dy > 0:
+            entry_y = (wall.top - rect.bottom) / dy
+            exit_y = (wall.bottom - rect.top) / dy
+        elif dy < 0:
+            entry_y = (wall.bottom - rect.top) / dy
+            exit_y = (wall.top - rect.bottom) / dy
+        elif rect.bottom <= wall.top or rect.top >= wall.bottom:
+            continue
+        else:
+            entry_y, exit_y = -math.inf, math.inf
+        
+        # Overlap starts once both axes overlap and ends when either stops
+        entry = max(entry_x, entry_y)
+        if entry >= min(exit_x, exit_y) or entry < 0 or entry >= hit_time:
+            continue
+        
+        hit_time = entry
+        if entry_x > entry_y:
+            normal_x, normal_y = (-1 if dx > 0 else 1), 0
+        else:
+            normal_x, normal_y = 0, (-1 if dy > 0 else 1)
+    
+    return hit_time, normal_x, normal_y
 
-        # Try vertical movement
-        test_pos = result_pos.copy()
-        test_pos.y += remaining_y
-        if not any(test_pos.colliderect(wall) for wall in walls):
-            result_pos.y = test_pos.y
+def move_and_slide(rect: pygame.Rect, dx: float, dy: float, walls: List[pygame.Rect]) -> pygame.Rect:
+    """
+    Move a rect by (dx, dy), stopping in exact contact with the first wall hit
+    and sliding the remaining movement along that wall.
+    Works for any moving body with an axis aligned bounding rect.
+    """
+    hit_time, normal_x, _ = sweep_rect(rect, dx, dy, walls)
+    # Wall edges are whole pixels, so rounding the contact position never
+    # pushes the rect into a wall it was separated from
+    moved_x = round(dx * hit_time)
+    moved_y = round(dy * hit_time)
+    result = rect.move(moved_x, moved_y)
+    
+    if hit_time < 1.0:
+        # Slide along the wall with the movement left on the other axis
+        if normal_x:
+            remaining_x, remaining_y = 0, dy - moved_y
+        else:
+            remaining_x, remaining_y = dx - moved_x, 0
+        slide_time, _, _ = sweep_rect(result, remaining_x, remaining_y, walls)
+        result.move_ip(round(remaining_x * slide_time), round(remaining_y * slide_time))
+    
+    return result
 
-    return result_pos
+def resolve_wall_collision(old_pos: pygame.Rect, new_pos: pygame.Rect, walls: List[pygame.Rect]) -> pygame.Rect:
+    """Resolve collision with walls using continuous (swept) collision detection"""
+    return move_and_slide(old_pos, new_pos.x - old_pos.x, new_pos.y - old_pos.y, walls)
 
 def line_intersects_rect(start: Tuple[float, float], end: Tuple[float, float], 
                         rect: pygame.Rect) -> bool:
@@ -177,17 +202,18 @@ def create_circle_dict(entity: Any) -> Dict:
         'radius': entity.radius
     }
 
-def handle_projectile_enemy_collision(projectile: Any, enemy: Any, effect_manager: Any) -> bool:
-    """Handle collision between projectile and enemy"""
-    if check_projectile_collision(create_circle_dict(projectile), create_circle_dict(enemy)):
+def handle_projectile_enemy_collision(projectiles: Any, enemy: Any, effect_manager: Any) -> bool:
+    """Handle collision between player projectiles in a ProjectileBuffer and an enemy"""
+    hits = projectiles.circle_hits(enemy.rect.center, enemy.radius, from_enemy=False)
+    for index in hits:
         enemy.take_damage(1)  # You can pass damage amount as parameter if needed
         effect_manager.create_wall_hit_effect(
-            projectile.rect.centerx,
-            projectile.rect.centery,
+            projectiles.x[index],
+            projectiles.y[index],
             random.uniform(0, 2 * math.pi)  # Random direction for enemy hits
         )
-        return True
-    return False
+        projectiles.alive[index] = False
+    return len(hits) > 0
 
 def handle_player_damage(player: Any, damage: int) -> None:
     """Handle damaging the player and check for death"""
@@ -195,19 +221,17 @@ def handle_player_damage(player: Any, damage: int) -> None:
     if player.current_health <= 0:
         player.die()
 
-def handle_projectile_player_collision(projectile: Any, player: Any) -> bool:
-    """Handle collision between projectile and player"""
-    if check_circle_collision(create_circle_dict(projectile), create_circle_dict(player)):
-        # Damage player using projectile's damage value
-        handle_player_damage(player, projectile.damage)
-        # Shrink projectile
-        projectile.radius *= projectile.shrink_rate
-        if projectile.radius <= projectile.min_size:
-            return True  # Remove projectile
-        # Update projectile rect size
-        projectile.update_rect_size()
+def handle_projectile_player_collision(projectiles: Any, player: Any) -> bool:
+    """Handle collision between enemy projectiles in a ProjectileBuffer and the player"""
+    hits = projectiles.circle_hits(player.rect.center, player.radius, from_enemy=True)
+    if len(hits) == 0:
         return False
-    return False
+    # Damage player using each projectile's damage value
+    handle_player_damage(player, float(projectiles.damage[hits].sum()))
+    # Shrink projectiles, removing the ones that got too small
+    for index in hits:
+        projectiles.shrink(index)
+    return True
 
 def handle_player_enemy_collision(player: Any, enemy: Any) -> bool:
     """Handle collision between player and enemy"""
@@ -216,11 +240,12 @@ def handle_player_enemy_collision(player: Any, enemy: Any) -> bool:
         return True
     return False
 
-def handle_projectile_projectile_collision(projectile1: Any, projectile2: Any) -> bool:
-    """Handle collision between two projectiles using circle collision"""
-    circle1 = create_circle_dict(projectile1)
-    circle2 = create_circle_dict(projectile2)
-    return check_circle_collision(circle1, circle2)
+def handle_projectile_projectile_collision(projectiles: Any, index1: int, index2: int) -> bool:
+    """Handle collision between two projectiles in a ProjectileBuffer using circle collision"""
+    dx = projectiles.x[index1] - projectiles.x[index2]
+    dy = projectiles.y[index1] - projectiles.y[index2]
+    reach = projectiles.radius[index1] + projectiles.radius[index2]
+    return dx * dx + dy * dy < reach * reach
 
 
 def handle_item_player_collision(item: Any, player: Any) -> bool:
@@ -232,50 +257,157 @@ def handle_item_player_collision(item: Any, player: Any) -> bool:
     }
     return check_circle_collision(create_circle_dict(player), item_circle)
 
-def handle_projectile_wall_collision(projectile, wall, game_state) -> bool:
-    """Handle collision between projectile and wall"""
-    if projectile.rect.colliderect(wall):
-        # Calculate which side of the wall was hit using velocity
-        proj_center_x = projectile.rect.centerx
-        proj_center_y = projectile.rect.centery
+def ray_cast_walls(start: Tuple[float, float], velocity: Tuple[float, float], radius: float,
+                   walls: List[pygame.Rect], max_time: float) -> Tuple[float, Optional[pygame.Rect], int, int]:
+    """
+    Find when a square of half size radius moving from start by velocity per tick
+    first overlaps a wall (same strict overlap as Rect.colliderect)
+    Returns: (time, wall, normal_x, normal_y)
+    wall is None if nothing is hit within max_time. A wall that already overlaps
+    the square at start is returned with time 0 and a zero normal.
+    """
+    x, y = start
+    vx, vy = velocity
+    hit_time = max_time
+    hit_wall = None
+    normal_x, normal_y = 0, 0
+    
+    for wall in walls:
+        # Grow the wall by the radius so the projectile can be treated as a point
+        left = wall.left - radius
+        right = wall.right + radius
+        top = wall.top - radius
+        bottom = wall.bottom + radius
+        
+        if left < x < right and top < y < bottom:
+            return 0.0, wall, 0, 0
         
-        # Calculate previous position using velocity
-        prev_x = proj_center_x - projectile.velocity[0]
-        prev_y = proj_center_y - projectile.velocity[1]
+        if vx > 0:
+            entry_x, exit_x = (left - x) / vx, (right - x) / vx
+        elif vx < 0:
+            entry_x, exit_x = (right - x) / vx, (left - x) / vx
+        elif left < x < right:
+            entry_x, exit_x = -math.inf, math.inf
+        else:
+            continue
+        
+        if vy > 0:
+            entry_y, exit_y = (top - y) / vy, (bottom - y) / vy
+        elif vy < 0:
+            entry_y, exit_y = (bottom - y) / vy, (top - y) / vy
+        elif top < y < bottom:
+            entry_y, exit_y = -math.inf, math.inf
+        else:
+            continue
+        
+        entry = max(entry_x, entry_y)
+        if entry >= min(exit_x, exit_y) or entry < 0 or entry >= hit_time:
+            continue
         
-        # Determine which side was hit
-        if prev_x < wall.left and proj_center_x >= wall.left:  # Hit from left
-            wall_normal = math.pi
-            spawn_x = wall.left
-            spawn_y = proj_center_y
-        elif prev_x > wall.right and proj_center_x <= wall.right:  # Hit from right
-            wall_normal = 0
-            spawn_x = wall.right
-            spawn_y = proj_center_y
-        elif prev_y < wall.top and proj_center_y >= wall.top:  # Hit from top
-            wall_normal = 3*math.pi/2
-            spawn_x = proj_center_x
-            spawn_y = wall.top
-        elif prev_y > wall.bottom and proj_center_y <= wall.bottom:  # Hit from bottom
-            wall_normal = math.pi/2
-            spawn_x = proj_center_x
-            spawn_y = wall.bottom
+        hit_time = entry
+        hit_wall = wall
+        if entry_x > entry_y:
+            normal_x, normal_y = (-1 if vx > 0 else 1), 0
         else:
-            # Fallback for edge cases
-            wall_normal = 0
-            spawn_x = proj_center_x
-            spawn_y = proj_center_y
+            normal_x, normal_y = 0, (-1 if vy > 0 else 1)
+    
+    return hit_time, hit_wall, normal_x, normal_y
+
+def cast_projectile(projectiles: Any, index: int, level: Any) -> None:
+    """
+    Ray-cast a projectile in a ProjectileBuffer against the level walls and
+    store the tick and point of its wall impact
+    """
+    x = projectiles.x[index]
+    y = projectiles.y[index]
+    vx = projectiles.vx[index]
+    vy = projectiles.vy[index]
+    radius = projectiles.radius[index]
+    
+    # Cast as far as the cast range, then cast again from there. The ray is
+    # walked in chunk sized segments so near hits never query far walls.
+    speed = math.hypot(vx, vy)
+    if speed > 0:
+        max_time = COLLISION['PROJECTILE_CAST_RANGE'] / speed
+        segment_time = min(level.chunk_size) / speed
+    else:
+        max_time = segment_time = math.inf
+    
+    pending = False
+    start_time = 0.0
+    while True:
+        end_time = min(start_time + segment_time, max_time)
+        # Area swept by the projectile during this segment
+        moved_time = end_time if speed > 0 else 0
+        start_x, end_x = x + vx * start_time, x + vx * moved_time
+        start_y, end_y = y + vy * start_time, y + vy * moved_time
+        left = math.floor(min(start_x, end_x) - radius)
+        top = math.floor(min(start_y, end_y) - radius)
+        bounds = pygame.Rect(left, top,
+                             math.ceil(max(start_x, end_x) + radius) - left + 1,
+                             math.ceil(max(start_y, end_y) + radius) - top + 1)
         
+        hit_time, wall, normal_x, normal_y = ray_cast_walls(
+            (x, y), (vx, vy), radius, level.walls_overlapping(bounds), end_time
+        )
+        pending = pending or not level.is_generated(bounds)
+        if wall is not None or end_time >= max_time:
+            break
+        start_time = end_time
+    projectiles.pending[index] = pending
+    
+    if wall is None:
+        # Nothing within range, cast again once the projectile gets there
+        projectiles.hit[index] = False
+        if speed > 0:
+            projectiles.impact_tick[index] = projectiles.tick + max(1, int(max_time))
+        else:
+            projectiles.impact_tick[index] = np.iinfo(np.int64).max
+        return
+    
+    projectiles.hit[index] = True
+    if normal_x == 0 and normal_y == 0:
+        # Already inside the wall
+        projectiles.impact_tick[index] = projectiles.tick
+        projectiles.impact_x[index] = x
+        projectiles.impact_y[index] = y
+        projectiles.impact_normal[index] = 0
+        return
+    
+    # Projectiles move in whole ticks, so the hit shows up on the first tick after entry
+    projectiles.impact_tick[index] = projectiles.tick + int(hit_time) + 1
+    
+    # Determine which side was hit
+    center_x = x + vx * hit_time
+    center_y = y + vy * hit_time
+    if normal_x < 0:  # Hit from left
+        wall_normal = math.pi
+        spawn_x, spawn_y = wall.left, center_y
+    elif normal_x > 0:  # Hit from right
+        wall_normal = 0
+        spawn_x, spawn_y = wall.right, center_y
+    elif normal_y < 0:  # Hit from top
+        wall_normal = 3*math.pi/2
+        spawn_x, spawn_y = center_x, wall.top
+    else:  # Hit from bottom
+        wall_normal = math.pi/2
+        spawn_x, spawn_y = center_x, wall.bottom
+    projectiles.impact_x[index] = spawn_x
+    projectiles.impact_y[index] = spawn_y
+    projectiles.impact_normal[index] = wall_normal
+
+def handle_projectile_wall_collision(projectiles: Any, effect_manager: Any) -> bool:
+    """Retire projectiles in a ProjectileBuffer whose precomputed wall impact is due"""
+    hits = projectiles.due(hit=True)
+    for index in hits:
         # Create effect at the collision point
-        game_state.effect_manager.create_wall_hit_effect(
-            spawn_x,
-            spawn_y,
-            wall_normal
+        effect_manager.create_wall_hit_effect(
+            projectiles.impact_x[index],
+            projectiles.impact_y[index],
+            projectiles.impact_normal[index]
         )
         
         # Remove the projectile
-        if projectile in game_state.projectiles:
-            game_state.projectiles.remove(projectile)
-        
-        return True
-    return False
\ No newline at end of file
+        projectiles.alive[index] = False
+    
+    return len(hits) > 0
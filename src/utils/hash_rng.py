@@ -0,0 +1,42 @@
+MASK_64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def mix64(value: int) -> int:
+    """SplitMix64 finalizer, scrambles a 64-bit integer into a well-distributed one"""
+    value = (value + GOLDEN_GAMMA) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class HashRng:
+    """
+    Counter-based random stream keyed by a tuple of integers.
+
+    The n-th draw is a hash of the key and n, so there is no hidden state to
+    seed or carry over: HashRng(seed, x, y) yields the same numbers in any
+    process, in any order of construction and on any Python version.
+    """
+    def __init__(self, *key: int):
+        mixed = 0
+        for part in key:
+            mixed = mix64(mixed ^ (part & MASK_64))
+        self.key = mixed
+        self.counter = 0
+
+    def next_u64(self) -> int:
+        self.counter += 1
+        return mix64((self.key + self.counter * GOLDEN_GAMMA) & MASK_64)
+
+    def random(self) -> float:
+        """Float in [0, 1), like random.random"""
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b] including both ends, like random.randint"""
+        span = b - a + 1
+        if span <= 0:
+            raise ValueError(f"empty range for randint({a}, {b})")
+        # Ranges here are tiny next to 2**64, so the modulo bias is negligible
+        return a + self.next_u64() % span
@@ -0,0 +1,44 @@
+from typing import Iterable, Tuple
+
+import numpy as np
+import pygame
+
+
+class OccupancyGrid:
+    """
+    Walls of a single chunk rasterized into a packed bit grid.
+
+    A cell's bit is set when any wall overlaps the cell, so answers err on
+    the side of "wall" by less than one cell. Each row is packed eight cells
+    per byte, most significant bit first (numpy.packbits order), and a point
+    test is a single byte lookup.
+    """
+    def __init__(self, walls: Iterable[pygame.Rect], origin: Tuple[int, int],
+                 size: Tuple[int, int], cell_size: int):
+        self.left, self.top = origin
+        self.cell_size = cell_size
+        self.columns = -(-size[0] // cell_size)
+        self.rows = -(-size[1] // cell_size)
+
+        cells = np.zeros((self.rows, self.columns), dtype=bool)
+        for wall in walls:
+            first_x = max((wall.left - self.left) // cell_size, 0)
+            first_y = max((wall.top - self.top) // cell_size, 0)
+            # Ceiling division, so a wall reaching into a cell marks it
+            last_x = min(-((self.left - wall.right) // cell_size), self.columns)
+            last_y = min(-((self.top - wall.bottom) // cell_size), self.rows)
+            cells[first_y:last_y, first_x:last_x] = True
+
+        self.bits = np.packbits(cells, axis=1)
+        self.row_bytes = self.bits.shape[1]
+        # Indexing bytes is much cheaper than indexing a numpy array
+        self.data = self.bits.tobytes()
+
+    def cell_blocked(self, column: int, row: int) -> bool:
+        """Check a cell by its column and row inside the chunk"""
+        return bool(self.data[row * self.row_bytes + (column >> 3)] >> (7 - (column & 7)) & 1)
+
+    def cells(self, first_column: int, first_row: int, last_column: int, last_row: int) -> np.ndarray:
+        """Unpack the cells in [first, last) of both axes into a bool array"""
+        rows = np.unpackbits(self.bits[first_row:last_row], axis=1, count=self.columns)
+        return rows[:, first_column:last_column].astype(bool)
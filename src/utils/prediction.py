@@ -1,54 +1,123 @@
 import math
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+def calculate_intercept_time(
+    shooter_pos: Tuple[float, float],
+    target_pos: Tuple[float, float],
+    target_velocity: Tuple[float, float],
+    projectile_speed: float
+) -> Optional[float]:
+    """
+    Calculate the earliest time at which a projectile can hit a moving target.
+
+    Solves |target_pos + target_velocity * t - shooter_pos| = projectile_speed * t
+    for the smallest t >= 0, which is the quadratic
+    (v.v - s^2) t^2 + 2 (d.v) t + d.d = 0 with d the offset to the target.
+
+    Returns:
+        Optional[float]: Time of the intercept, or None if the target outruns the projectile
+    """
+    dx = target_pos[0] - shooter_pos[0]
+    dy = target_pos[1] - shooter_pos[1]
+    vx, vy = target_velocity
+
+    a = vx * vx + vy * vy - projectile_speed * projectile_speed
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy
+
+    if c == 0:
+        return 0.0
+    if abs(a) < 1e-9:
+        # Target as fast as the projectile, only a target coming closer is caught
+        return -c / b if b < 0 else None
+
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return None
+    root = math.sqrt(discriminant)
+    # Stable form of both roots, avoids cancellation when b is close to root
+    q = -0.5 * (b + math.copysign(root, b))
+    times = [t for t in (q / a, c / q if q else math.inf) if t >= 0]
+    return min(times) if times else None
 
 def calculate_intercept_point(
     shooter_pos: Tuple[float, float],
     target_pos: Tuple[float, float],
     target_velocity: Tuple[float, float],
     projectile_speed: float
-) -> Tuple[float, float]:
+) -> Optional[Tuple[float, float]]:
     """
     Calculate the intercept point for a projectile to hit a moving target.
-    
+
     Args:
         shooter_pos: (x, y) position of the shooter
         target_pos: (x, y) position of the target
         target_velocity: (vx, vy) velocity of the target
         projectile_speed: Speed of the projectile
-    
+
     Returns:
         Tuple[float, float]: Predicted intercept point (x, y), or None if no intercept is possible
     """
-    # Get target speed
-    target_speed = math.hypot(target_velocity[0], target_velocity[1])
-    
-    if target_speed > 0:  # Only predict if target is moving
-        # Calculate vector from shooter to target
-        dx = target_pos[0] - shooter_pos[0]
-        dy = target_pos[1] - shooter_pos[1]
-        distance = math.hypot(dx, dy)
-
-        # Time for projectile to reach target if target were stationary
-        base_time = distance / projectile_speed
-        
-        # First approximation of intercept point
-        predicted_x = target_pos[0] + (target_velocity[0] * base_time)
-        predicted_y = target_pos[1] + (target_velocity[1] * base_time)
-        
-        # Iterate a few times to refine the prediction
-        for _ in range(3):
-            # Calculate new distance to predicted point
-            dx = predicted_x - shooter_pos[0]
-            dy = predicted_y - shooter_pos[1]
-            distance = math.hypot(dx, dy)
-            
-            # Calculate new time to reach this point
-            time_to_target = distance / projectile_speed
-            
-            # Update prediction
-            predicted_x = target_pos[0] + (target_velocity[0] * time_to_target)
-            predicted_y = target_pos[1] + (target_velocity[1] * time_to_target)
-        
-        return (predicted_x, predicted_y)
-    
-    return None 
\ No newline at end of file
+    time_to_target = calculate_intercept_time(shooter_pos, target_pos, target_velocity, projectile_speed)
+    if time_to_target is None:
+        return None
+
+    return (target_pos[0] + target_velocity[0] * time_to_target,
+            target_pos[1] + target_velocity[1] * time_to_target)
+
+def calculate_intercept_points(
+    shooter_pos: np.ndarray,
+    target_pos: np.ndarray,
+    target_velocity: np.ndarray,
+    projectile_speed
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched calculate_intercept_point for many shooter and target pairs at once.
+
+    Args:
+        shooter_pos: (n, 2) shooter positions
+        target_pos: (n, 2) or (2,) target positions
+        target_velocity: (n, 2) or (2,) target velocities
+        projectile_speed: (n,) projectile speeds or a single speed
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n, 2) intercept points and an (n,) bool
+        array marking which of them exist. Points without an intercept hold
+        the target position.
+    """
+    shooter_pos = np.asarray(shooter_pos, dtype=np.float64)
+    target_pos = np.asarray(target_pos, dtype=np.float64)
+    target_velocity = np.asarray(target_velocity, dtype=np.float64)
+    speed = np.asarray(projectile_speed, dtype=np.float64)
+
+    offset = target_pos - shooter_pos
+    target_pos, target_velocity = np.broadcast_arrays(target_pos, target_velocity)
+    offset, target_velocity = np.broadcast_arrays(offset, target_velocity)
+    a = np.einsum('ij,ij->i', target_velocity, target_velocity) - speed * speed
+    b = 2 * np.einsum('ij,ij->i', offset, target_velocity)
+    c = np.einsum('ij,ij->i', offset, offset)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discriminant = b * b - 4 * a * c
+        root = np.sqrt(np.maximum(discriminant, 0))
+        q = -0.5 * (b + np.copysign(root, b))
+        first = q / a
+        second = np.where(q != 0, c / q, np.inf)
+        # Smallest non-negative root of the quadratic
+        first = np.where(first >= 0, first, np.inf)
+        second = np.where(second >= 0, second, np.inf)
+        time_to_target = np.minimum(first, second)
+        time_to_target = np.where(discriminant >= 0, time_to_target, np.inf)
+
+        # Target as fast as the projectile, the equation is linear
+        linear = np.abs(a) < 1e-9
+        linear_time = np.where(b < 0, -c / b, np.inf)
+        time_to_target = np.where(linear, linear_time, time_to_target)
+        time_to_target = np.where(c == 0, 0.0, time_to_target)
+
+    valid = np.isfinite(time_to_target)
+    time_to_target = np.where(valid, time_to_target, 0.0)
+    points = np.broadcast_to(target_pos, offset.shape) + target_velocity * time_to_target[:, None]
+    return points, valid
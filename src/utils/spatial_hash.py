@@ -0,0 +1,55 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class SpatialHash:
+    """
+    Uniform grid that buckets objects by the cell their center falls into.
+
+    Objects are inserted by center point only, so the cell size must be at
+    least as large as the biggest collision distance being tested. A query
+    then only has to look at the cell of the point and its 8 neighbours.
+    """
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Any]] = defaultdict(list)
+
+    def cell_coords(self, x: float, y: float) -> Tuple[int, int]:
+        """Convert world coordinates to grid cell coordinates"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        """Remove all objects so the grid can be rebuilt for the next tick"""
+        self.cells.clear()
+
+    def insert(self, obj: Any, x: float, y: float):
+        """Add an object to the cell containing (x, y)"""
+        self.cells[self.cell_coords(x, y)].append(obj)
+
+    def nearby(self, x: float, y: float) -> Iterator[Any]:
+        """Yield every object in the cell containing (x, y) and its neighbours"""
+        cell_x, cell_y = self.cell_coords(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                bucket = self.cells.get((cell_x + dx, cell_y + dy))
+                if bucket:
+                    yield from bucket
+
+    def remove(self, obj: Any, x: float, y: float):
+        """Take out an object that was inserted at (x, y)"""
+        cell = self.cell_coords(x, y)
+        bucket = self.cells.get(cell)
+        if bucket and obj in bucket:
+            bucket.remove(obj)
+            if not bucket:
+                del self.cells[cell]
+
+    def in_rect(self, left: float, top: float, right: float, bottom: float) -> Iterator[Any]:
+        """Yield every object in the cells overlapping the given area"""
+        first_x, first_y = self.cell_coords(left, top)
+        last_x, last_y = self.cell_coords(right, bottom)
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    yield from bucket
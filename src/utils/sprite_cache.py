@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+from src.constants import SPRITE_CACHE
+
+class SpriteCache:
+    """
+    Bounded LRU cache of pre-rendered circle sprites.
+
+    Sprites are keyed by (radius, color, alpha bucket). Radii are rounded to
+    half pixels and alpha to SPRITE_CACHE['ALPHA_BUCKETS'] levels, so values
+    that change every frame still land on a small set of surfaces. Returned
+    surfaces are shared and must not be drawn on.
+    """
+    def __init__(self, max_size: int = SPRITE_CACHE['MAX_SPRITES']):
+        self.max_size = max_size
+        self.sprites: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self.alpha_step = 256 // SPRITE_CACHE['ALPHA_BUCKETS']
+
+    def circle(self, radius: float, color: Tuple[int, ...], alpha: int = 255) -> pygame.Surface:
+        """Get a circle sprite of the given radius, color and alpha"""
+        radius = round(radius * 2) / 2
+        bucket = min(255, alpha) // self.alpha_step
+        key = (radius, tuple(color[:3]), bucket)
+
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        # Use the top of the bucket so fully opaque stays fully opaque
+        bucket_alpha = min(255, bucket * self.alpha_step + self.alpha_step - 1)
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color[:3], bucket_alpha), (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+# Shared cache used by every entity and effect
+_sprite_cache = SpriteCache()
+
+def get_circle_sprite(radius: float, color: Tuple[int, ...], alpha: int = 255) -> pygame.Surface:
+    """Get a shared, cached circle sprite"""
+    return _sprite_cache.circle(radius, color, alpha)
+
+def clear_sprite_cache():
+    """Drop every cached sprite, e.g. after the color palette changed"""
+    _sprite_cache.clear()
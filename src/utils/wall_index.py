@@ -0,0 +1,69 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple
+
+import pygame
+
+
+class WallIndex:
+    """
+    Immutable spatial index over the walls of a single chunk.
+
+    Generated walls are thin along one axis, so every wall is stored in one of
+    two lists sorted along its thin axis: vertical walls by left edge and
+    horizontal walls by top edge. A query bisects each list down to the walls
+    whose thin span can reach the query rect and only tests those.
+    """
+    def __init__(self, walls: Iterable[pygame.Rect]):
+        self.walls: Tuple[pygame.Rect, ...] = tuple(walls)
+
+        vertical = sorted((wall for wall in self.walls if wall.width <= wall.height),
+                          key=lambda wall: wall.left)
+        horizontal = sorted((wall for wall in self.walls if wall.width > wall.height),
+                            key=lambda wall: wall.top)
+
+        self._vertical = tuple(vertical)
+        self._vertical_keys = tuple(wall.left for wall in vertical)
+        self._vertical_reach = max((wall.width for wall in vertical), default=0)
+
+        self._horizontal = tuple(horizontal)
+        self._horizontal_keys = tuple(wall.top for wall in horizontal)
+        self._horizontal_reach = max((wall.height for wall in horizontal), default=0)
+
+    def __len__(self) -> int:
+        return len(self.walls)
+
+    def overlapping(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Get all walls that overlap rect (same semantics as Rect.colliderect)"""
+        result = []
+
+        # A wall can only overlap if its left edge lies in (rect.left - reach, rect.right)
+        start = bisect_right(self._vertical_keys, rect.left - self._vertical_reach)
+        end = bisect_left(self._vertical_keys, rect.right)
+        for wall in self._vertical[start:end]:
+            if wall.colliderect(rect):
+                result.append(wall)
+
+        start = bisect_right(self._horizontal_keys, rect.top - self._horizontal_reach)
+        end = bisect_left(self._horizontal_keys, rect.bottom)
+        for wall in self._horizontal[start:end]:
+            if wall.colliderect(rect):
+                result.append(wall)
+
+        return result
+
+    def near(self, point: Tuple[float, float], radius: float) -> List[pygame.Rect]:
+        """Get all walls that intersect the circle at point with the given radius"""
+        x, y = point
+        left = math.floor(x - radius)
+        top = math.floor(y - radius)
+        bounds = pygame.Rect(left, top, math.ceil(x + radius) - left, math.ceil(y + radius) - top)
+
+        result = []
+        for wall in self.overlapping(bounds):
+            # Distance from the circle center to the closest point on the wall
+            dx = x - max(wall.left, min(x, wall.right))
+            dy = y - max(wall.top, min(y, wall.bottom))
+            if dx * dx + dy * dy < radius * radius:
+                result.append(wall)
+        return result
@@ -0,0 +1,66 @@
+from typing import Dict, Tuple
+
+import pygame
+
+from src.constants import COLORS
+
+class WallLayerCache:
+    """
+    Pre-rendered wall layer per chunk.
+
+    Chunk geometry never changes once generated, so each chunk is rasterized
+    once (background and walls) into an opaque surface on first view and then
+    drawn with a single blit. Layers are rebuilt when the palette changes and
+    evicted once their chunk is no longer next to the camera.
+    """
+    def __init__(self, chunk_size: Tuple[int, int]):
+        self.chunk_size = chunk_size
+        self.layers: Dict[Tuple[int, int], pygame.Surface] = {}
+        self.palette = None
+
+    def _render_chunk(self, chunk_coords: Tuple[int, int], walls) -> pygame.Surface:
+        """Rasterize a chunk's walls into a new surface"""
+        layer = pygame.Surface(self.chunk_size)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(COLORS['WHITE'])
+        
+        origin_x = chunk_coords[0] * self.chunk_size[0]
+        origin_y = chunk_coords[1] * self.chunk_size[1]
+        for wall in walls:
+            pygame.draw.rect(layer, COLORS['BLACK'], wall.move(-origin_x, -origin_y))
+        return layer
+
+    def draw(self, surface: pygame.Surface, camera, view):
+        """Draw the walls of every chunk under the screen (view is the tick's WorldView)"""
+        # Rebuild everything if dark mode changed the wall or background color
+        palette = (COLORS['WHITE'], COLORS['BLACK'])
+        if palette != self.palette:
+            self.layers.clear()
+            self.palette = palette
+        
+        offset_x = int(camera.x)
+        offset_y = int(camera.y)
+        visible_chunks = view.visible_chunks
+        first_chunk = min(visible_chunks)
+        last_chunk = max(visible_chunks)
+        
+        # Evict layers that are no longer next to the screen
+        for chunk_coords in list(self.layers):
+            if not (first_chunk[0] - 1 <= chunk_coords[0] <= last_chunk[0] + 1 and
+                    first_chunk[1] - 1 <= chunk_coords[1] <= last_chunk[1] + 1):
+                del self.layers[chunk_coords]
+        
+        blits = []
+        for chunk_coords in visible_chunks:
+            walls = view.level.chunks.get(chunk_coords)
+            if walls is None:
+                continue  # Not generated yet, background shows through
+            layer = self.layers.get(chunk_coords)
+            if layer is None:
+                layer = self._render_chunk(chunk_coords, walls)
+                self.layers[chunk_coords] = layer
+            blits.append((layer, (chunk_coords[0] * self.chunk_size[0] - offset_x,
+                                  chunk_coords[1] * self.chunk_size[1] - offset_y)))
+        
+        surface.blits(blits, False)
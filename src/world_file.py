@@ -0,0 +1,164 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from queue import Queue
+from typing import Dict, Tuple
+
+from src.room_graph import RoomGraph
+
+# File layout (little-endian):
+#   header: magic, format version, world seed, chunk width, chunk height
+#   records, appended in generation order:
+#       chunk x, chunk y, wall count, room count, door count, then
+#       4 int32 per wall (x, y, width, height), 4 int32 per room (same) and
+#       6 int32 per door (room a, room b, x, y, width, height)
+HEADER = struct.Struct('<8sIQII')
+RECORD = struct.Struct('<iiIII')
+MAGIC = b'GREPWRLD'
+VERSION = 3  # 2: chunks generated with HashRng, 3: room graphs
+WALL_SIZE = 4 * 4
+ROOM_SIZE = RoomGraph.ROOM_SIZE * 4
+DOOR_SIZE = RoomGraph.DOOR_SIZE * 4
+
+class WorldFile:
+    """
+    Append-only binary store of generated chunks, read through mmap.
+
+    Each chunk is one record of int32 wall, room and door values. Opening a file
+    only walks the record headers to build the chunk index; reading a chunk
+    is a slice of the memory map. Writes are queued and appended by a
+    background thread, so storing a chunk never blocks the game loop.
+    """
+    def __init__(self, path: str, seed: int, chunk_size: Tuple[int, int]):
+        """
+        seed: World seed for a new file, an existing file keeps its own seed
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        # Chunk coordinates -> (offset of the wall data, wall, room and door count)
+        self.index: Dict[Tuple[int, int], Tuple[int, int, int, int]] = {}
+        self.queued = set()
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            self.seed = self._read_index()
+        else:
+            self.file = open(path, 'w+b')
+            self.file.write(HEADER.pack(MAGIC, VERSION, seed, chunk_size[0], chunk_size[1]))
+            self.file.flush()
+            self.seed = seed
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.write_queue = Queue()
+        self.writer = threading.Thread(target=self._write_worker, daemon=True)
+        self.writer.start()
+
+    def _read_index(self) -> int:
+        """Validate the header and index every complete record, returns the world seed"""
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{self.path} is not a world file")
+        magic, version, seed, chunk_width, chunk_height = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} world file")
+        if (chunk_width, chunk_height) != tuple(self.chunk_size):
+            raise ValueError(f"{self.path} was made for {chunk_width}x{chunk_height} chunks")
+
+        offset = HEADER.size
+        file_size = os.path.getsize(self.path)
+        while offset + RECORD.size <= file_size:
+            self.file.seek(offset)
+            chunk_x, chunk_y, walls, rooms, doors = RECORD.unpack(self.file.read(RECORD.size))
+            end = offset + RECORD.size + walls * WALL_SIZE + rooms * ROOM_SIZE + doors * DOOR_SIZE
+            if end > file_size:
+                break
+            self.index[(chunk_x, chunk_y)] = (offset + RECORD.size, walls, rooms, doors)
+            offset = end
+
+        # Drop a record cut short by a crash so new records append cleanly
+        if offset != file_size:
+            print(f"Dropping incomplete chunk record at the end of {self.path}")
+            self.file.truncate(offset)
+        return seed
+
+    def __contains__(self, chunk_coords: Tuple[int, int]) -> bool:
+        return chunk_coords in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def read_chunk(self, chunk_coords: Tuple[int, int]) -> Tuple[memoryview, memoryview, memoryview]:
+        """Get a chunk's walls, rooms and doors as flat int32 views"""
+        offset, walls, rooms, doors = self.index[chunk_coords]
+        rooms_start = offset + walls * WALL_SIZE
+        doors_start = rooms_start + rooms * ROOM_SIZE
+        end = doors_start + doors * DOOR_SIZE
+        if end > len(self.map):
+            # The writer appended since the file was mapped. The old map is
+            # closed once the last view handed out from it is released.
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(self.map)
+        return (self._int_view(data[offset:rooms_start]),
+                self._int_view(data[rooms_start:doors_start]),
+                self._int_view(data[doors_start:end]))
+
+    @staticmethod
+    def _int_view(data: memoryview) -> memoryview:
+        if sys.byteorder != 'little':
+            values = array('i', data)
+            values.byteswap()
+            return memoryview(values)
+        return data.cast('i')
+
+    def write_chunk(self, chunk_coords: Tuple[int, int], walls: array, rooms: array, doors: array):
+        """Queue a chunk's flat int32 wall, room and door arrays to be appended in the background"""
+        if chunk_coords in self.index or chunk_coords in self.queued:
+            return
+        self.queued.add(chunk_coords)
+        self.write_queue.put((chunk_coords, (walls, rooms, doors)))
+
+    def _write_worker(self):
+        """Background thread appending queued chunks to the end of the file"""
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                self.write_queue.task_done()
+                break
+            chunk_coords, arrays = item
+            try:
+                if sys.byteorder != 'little':
+                    arrays = [array('i', values) for values in arrays]
+                    for values in arrays:
+                        values.byteswap()
+                walls, rooms, doors = arrays
+                counts = (len(walls) // 4, len(rooms) // RoomGraph.ROOM_SIZE,
+                          len(doors) // RoomGraph.DOOR_SIZE)
+                self.file.seek(0, os.SEEK_END)
+                offset = self.file.tell()
+                self.file.write(RECORD.pack(chunk_coords[0], chunk_coords[1], *counts))
+                for values in arrays:
+                    self.file.write(values.tobytes())
+                self.file.flush()
+                # Publish only once the record is complete on disk
+                self.index[chunk_coords] = (offset + RECORD.size,) + counts
+            except Exception as e:
+                print(f"Error writing chunk {chunk_coords} to {self.path}: {e}")
+            finally:
+                self.queued.discard(chunk_coords)
+                self.write_queue.task_done()
+
+    def flush(self):
+        """Wait until every queued chunk has been written"""
+        self.write_queue.join()
+
+    def close(self):
+        """Finish pending writes and close the file"""
+        if self.file.closed:
+            return
+        self.write_queue.put(None)
+        self.writer.join()
+        self.map.close()
+        self.file.close()
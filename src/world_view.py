@@ -0,0 +1,46 @@
+from typing import Tuple
+
+import pygame
+
+from src.constants import WINDOW
+
+class WorldView:
+    """
+    Camera-derived world queries shared by every subsystem for one tick.
+
+    update() is called once per tick after the camera moved. It recomputes
+    the screen rect and the chunks under it only when the camera's pixel
+    position changed. Queries read the cached results instead of each
+    rebuilding them from the camera.
+    """
+    def __init__(self, level):
+        self.level = level
+        self.camera_pos = None
+        # Screen area in world coordinates
+        self.screen_rect = pygame.Rect(0, 0, WINDOW['WIDTH'], WINDOW['HEIGHT'])
+        self.camera_chunk: Tuple[int, int] = (0, 0)
+        # Chunks under the screen at the start or end of this tick, so an
+        # interpolated camera between the two is covered as well
+        self.visible_chunks: Tuple[Tuple[int, int], ...] = ()
+
+    def update(self, camera):
+        camera_pos = (int(camera.x), int(camera.y))
+        if camera_pos != self.camera_pos:
+            self.camera_pos = camera_pos
+            self.screen_rect = pygame.Rect(camera_pos, (WINDOW['WIDTH'], WINDOW['HEIGHT']))
+            self.camera_chunk = self.level.get_chunk_coords(camera.x, camera.y)
+
+            swept = self.screen_rect.union(pygame.Rect(
+                int(camera.prev_x), int(camera.prev_y), WINDOW['WIDTH'], WINDOW['HEIGHT']
+            ))
+            first_chunk = self.level.get_chunk_coords(swept.left, swept.top)
+            last_chunk = self.level.get_chunk_coords(swept.right - 1, swept.bottom - 1)
+            self.visible_chunks = tuple(
+                (chunk_x, chunk_y)
+                for chunk_x in range(first_chunk[0], last_chunk[0] + 1)
+                for chunk_y in range(first_chunk[1], last_chunk[1] + 1)
+            )
+
+    def is_on_screen(self, rect: pygame.Rect) -> bool:
+        """Check if a world-space rect overlaps the screen"""
+        return self.screen_rect.colliderect(rect)